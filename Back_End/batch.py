@@ -0,0 +1,170 @@
+"""Run the backend over many CSVs from the command line.
+
+Examples (from the repository root):
+
+    python -m Back_End.batch clean exports/ --output cleaned/ --jobs 8
+    python -m Back_End.batch report "exports/2024-*.csv" --output reports/
+    python -m Back_End.batch report huge.csv.gz --output reports/ --quick
+    python -m Back_End.batch train exports/ --output models/
+    python -m Back_End.batch score new_rows/ --model models/sales_model.pkl --output scored/
+    python -m Back_End.batch score new_rows/ --model models/*.pkl --output compared/
+"""
+import argparse
+import glob
+import os
+import shutil
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+TASKS = ['clean', 'report', 'train', 'score']
+INPUT_PATTERNS = ['*.csv', '*.csv.gz', '*.csv.bz2', '*.csv.zst', '*.zip']  # A zip of partitions is one dataset
+
+
+def expand_inputs(inputs):
+    """Resolve directories, glob patterns and file paths to a sorted list of files."""
+    paths = set()
+    for item in inputs:
+        if os.path.isdir(item):
+            for pattern in INPUT_PATTERNS:
+                paths.update(glob.glob(os.path.join(item, pattern)))
+        elif glob.has_magic(item):
+            paths.update(p for p in glob.glob(item) if os.path.isfile(p))
+        elif os.path.isfile(item):
+            paths.add(item)
+    return sorted(paths)
+
+
+def output_stem(path):
+    name = os.path.basename(path)
+    for suffix in ('.csv.gz', '.csv.bz2', '.csv.zst', '.csv', '.zip'):
+        if name.lower().endswith(suffix):
+            return name[:-len(suffix)]
+    return name
+
+
+def run_task(task, path, output_dir, model_paths=None, quick=False, outliers=None):
+    """Run one task on one file and write its result; returns (path, error, output, seconds)."""
+    from Back_End import csv_processor, csv_processor2, csv_processor3, testing
+
+    start = time.perf_counter()
+    stem = output_stem(path)
+    try:
+        if task == 'clean':
+            result = csv_processor.process_file(path, outliers=outliers)
+            if isinstance(result, str):
+                return path, result, None, time.perf_counter() - start
+            output = os.path.join(output_dir, f"{stem}_cleaned.csv")
+            with open(output, "w", encoding="utf-8", newline="") as f:
+                shutil.copyfileobj(result, f)
+
+        elif task == 'report':
+            result = csv_processor2.process_file(path, quick=quick)
+            if isinstance(result, tuple):
+                return path, result[1], None, time.perf_counter() - start
+            output = os.path.join(output_dir, f"{stem}_report.pdf")
+            shutil.move(result, output)
+            os.chmod(output, 0o644)  # Temporary files are created owner-only
+
+        elif task == 'train':
+            output = os.path.join(output_dir, f"{stem}_model.pkl")
+            result = csv_processor3.process_file(path, model_filename=output, outliers=outliers)
+            if isinstance(result, str):
+                return path, result, None, time.perf_counter() - start
+
+        else:
+            # Several models share one read and one preprocessing pass per distinct preprocessor
+            result, error = testing.score_models(path, model_paths)
+            if error:
+                return path, error, None, time.perf_counter() - start
+            output = os.path.join(output_dir, f"{stem}_predictions.csv")
+            with open(output, "w", encoding="utf-8", newline="") as f:
+                shutil.copyfileobj(result, f)
+
+    except Exception as e:
+        return path, f"{type(e).__name__}: {e}", None, time.perf_counter() - start
+
+    return path, None, output, time.perf_counter() - start
+
+
+def limit_worker_budget(cpus):
+    """Give each batch worker its share of the CPUs before the backend is imported."""
+    os.environ["MYCSV_CPU_BUDGET"] = str(cpus)
+
+
+def run_pool(task, paths, output_dir, workers, cpus_per_worker, on_result, model_paths=None, quick=False, outliers=None):
+    """Run files in one process pool, passing each result to ``on_result``; returns the paths lost to a broken pool."""
+    broken = []
+    with ProcessPoolExecutor(max_workers=workers, initializer=limit_worker_budget, initargs=(cpus_per_worker,)) as pool:
+        futures = {pool.submit(run_task, task, path, output_dir, model_paths, quick, outliers): path for path in paths}
+        for future in as_completed(futures):
+            path = futures[future]
+            try:
+                result = future.result()
+            except BrokenProcessPool:
+                broken.append(path)  # A worker died; every file still in the pool is lost with it
+                continue
+            except Exception as e:
+                result = (path, f"{type(e).__name__}: {e}", None, 0.0)
+            on_result(*result)
+    return broken
+
+
+def run_batch(task, paths, output_dir, jobs=None, model_paths=None, quick=False, outliers=None):
+    """Process files in parallel, reporting each as it finishes; returns the failures.
+
+    A worker that is killed (out of memory, crash) breaks the whole pool. The
+    files lost with it are retried one per fresh single-worker pool, so only
+    a file that kills its worker again is reported as failed.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    failures = []
+    done = 0
+
+    def report(path, error, output, seconds):
+        nonlocal done
+        done += 1
+        if error:
+            failures.append((path, error))
+            print(f"[{done}/{len(paths)}] FAILED {path} ({seconds:.1f}s): {error}", flush=True)
+        else:
+            print(f"[{done}/{len(paths)}] ok     {path} -> {output} ({seconds:.1f}s)", flush=True)
+
+    # Workers split the machine, so parallel training runs do not oversubscribe it
+    cpus_per_worker = max(1, (os.cpu_count() or 1) // max(1, min(jobs or os.cpu_count() or 1, len(paths))))
+    broken = run_pool(task, paths, output_dir, jobs, cpus_per_worker, report, model_paths, quick, outliers)
+
+    for path in broken:
+        if run_pool(task, [path], output_dir, 1, os.cpu_count() or 1, report, model_paths, quick, outliers):
+            report(path, "The worker process died (out of memory or crashed).", None, 0.0)
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run MYCSV cleaning, reports, training or scoring over many CSVs.")
+    parser.add_argument('task', choices=TASKS)
+    parser.add_argument('inputs', nargs='+', help="CSV files, directories or glob patterns")
+    parser.add_argument('--output', required=True, help="Directory for the results")
+    parser.add_argument('--jobs', type=int, default=os.cpu_count(), help="Files processed in parallel")
+    parser.add_argument('--model', nargs='+', help="Model package(s) (.pkl) used by the score task")
+    parser.add_argument('--quick', action='store_true', help="Build reports from a stratified random sample")
+    parser.add_argument('--outliers', choices=['clip', 'remove'], help="Outlier handling for the clean and train tasks")
+    args = parser.parse_args(argv)
+
+    if args.task == 'score' and not args.model:
+        parser.error("the score task requires --model")
+
+    paths = expand_inputs(args.inputs)
+    if not paths:
+        print("No input files found.", file=sys.stderr)
+        return 1
+
+    print(f"{args.task}: {len(paths)} file(s) with {args.jobs} worker(s)", flush=True)
+    failures = run_batch(args.task, paths, args.output, args.jobs, args.model, args.quick, args.outliers)
+    print(f"Done: {len(paths) - len(failures)} succeeded, {len(failures)} failed.")
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,82 @@
+import hashlib
+import os
+import tempfile
+import numpy as np
+import pandas as pd
+
+CACHE_DIR = os.environ.get("MYCSV_CHART_CACHE_DIR", os.path.join(tempfile.gettempdir(), "mycsv_chart_cache"))
+MAX_CACHE_BYTES = int(os.environ.get("MYCSV_CHART_CACHE_BYTES", 256 * 1024 * 1024))
+
+
+def fingerprint(*parts):
+    """Content hash of chart inputs: Series/DataFrames by value, everything else by repr."""
+    digest = hashlib.sha256()
+    for part in parts:
+        if isinstance(part, (pd.Series, pd.DataFrame)):
+            digest.update(pd.util.hash_pandas_object(part, index=False).to_numpy().tobytes())
+            names = part.name if isinstance(part, pd.Series) else tuple(part.columns)
+            digest.update(repr((names, str(getattr(part, 'dtype', '')))).encode())
+            if isinstance(part, pd.DataFrame):
+                digest.update(repr(tuple(part.index)).encode())
+        elif isinstance(part, np.ndarray):
+            digest.update(np.ascontiguousarray(part).tobytes())
+            digest.update(str(part.dtype).encode())
+        else:
+            digest.update(repr(part).encode())
+        digest.update(b"|")
+    return digest.hexdigest()
+
+
+class ChartCache:
+    """Rendered chart PNGs on local disk, evicted least-recently-used past a size limit."""
+
+    def __init__(self, cache_dir=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, f"{key}.png")
+
+    def get(self, key):
+        path = self._path(key)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            os.utime(path)  # Mark as recently used
+            return data
+        except OSError:
+            return None
+
+    def put(self, key, data):
+        fd, tmp_path = tempfile.mkstemp(dir=self.cache_dir, suffix=".tmp")
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, self._path(key))
+
+    def render(self, render, *args, params=()):
+        """Return the PNG for ``render(*args)``, rendering only if its inputs changed."""
+        key = fingerprint(render.__name__, params, *args)
+        data = self.get(key)
+        if data is None:
+            data = render(*args)
+            self.put(key, data)
+        return data
+
+    def evict(self):
+        """Delete least recently used charts until the cache fits in max_bytes."""
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.endswith(".png"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(path)
+                total -= size
+            except OSError:
+                continue
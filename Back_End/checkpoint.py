@@ -0,0 +1,121 @@
+import hashlib
+import json
+import os
+import re
+import shutil
+import tempfile
+import time
+import joblib
+
+WORK_DIR = os.environ.get("MYCSV_WORK_DIR", os.path.join(tempfile.gettempdir(), "mycsv_work"))
+MAX_AGE_SECONDS = 24 * 60 * 60  # Work directories untouched for a day are pruned
+MAX_WORK_BYTES = int(os.environ.get("MYCSV_WORK_BYTES", 2 * 1024 * 1024 * 1024))  # Older runs are evicted past this
+
+
+def hash_input(file, chunk_size=1 << 20):
+    """Hash the content of a file path or file-like object."""
+    digest = hashlib.sha256()
+    if isinstance(file, (list, tuple)):
+        for part in file:
+            digest.update(hash_input(part, chunk_size).encode())
+    elif isinstance(file, str):
+        with open(file, "rb") as f:
+            for chunk in iter(lambda: f.read(chunk_size), b""):
+                digest.update(chunk)
+    else:
+        file.seek(0)
+        for chunk in iter(lambda: file.read(chunk_size), b""):
+            digest.update(chunk if isinstance(chunk, bytes) else chunk.encode())
+        file.seek(0)  # Reset stream for later use
+    return digest.hexdigest()
+
+
+def directory_size(path):
+    total = 0
+    for root, _, files in os.walk(path):
+        for name in files:
+            try:
+                total += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                continue
+    return total
+
+
+def prune_work_dir(work_dir=WORK_DIR, max_age=MAX_AGE_SECONDS, max_bytes=MAX_WORK_BYTES, keep=None):
+    """Remove checkpoint directories unused for ``max_age``, then the least recently used
+    ones until the rest fit in ``max_bytes``. The directory named ``keep`` is never removed."""
+    if not os.path.isdir(work_dir):
+        return
+    cutoff = time.time() - max_age
+    entries = []
+    for name in os.listdir(work_dir):
+        path = os.path.join(work_dir, name)
+        try:
+            if not os.path.isdir(path) or name == keep:
+                continue
+            mtime = os.path.getmtime(path)
+            if mtime < cutoff:
+                shutil.rmtree(path, ignore_errors=True)
+            else:
+                entries.append((mtime, directory_size(path), path))
+        except OSError:
+            continue
+
+    total = sum(size for _, size, _ in entries)
+    for _, size, path in sorted(entries):
+        if total <= max_bytes:
+            break
+        shutil.rmtree(path, ignore_errors=True)
+        total -= size
+
+
+class Checkpoint:
+    """Completed pipeline stages persisted on local disk.
+
+    Stages are keyed on the input content and the options of the run, so a
+    retry of the same upload resumes after the last stage that finished.
+    Runs clear their checkpoints once their result is produced; directories
+    left by failed runs are pruned by age and by the MAX_WORK_BYTES budget.
+    """
+
+    def __init__(self, file, options=None, work_dir=WORK_DIR):
+        options_key = json.dumps(options or {}, sort_keys=True, default=str)
+        key = hashlib.sha256((hash_input(file) + options_key).encode()).hexdigest()[:32]
+        prune_work_dir(work_dir, keep=key)
+        self.path = os.path.join(work_dir, key)
+        os.makedirs(self.path, exist_ok=True)
+        os.utime(self.path)
+
+    def _stage_path(self, name):
+        safe = re.sub(r"[^\w.-]", "_", name)[:80]
+        suffix = hashlib.sha1(name.encode()).hexdigest()[:8]
+        return os.path.join(self.path, f"{safe}-{suffix}.pkl")
+
+    def has(self, name):
+        return os.path.exists(self._stage_path(name))
+
+    def stage(self, name, compute):
+        """Return the stored result of ``name``, computing and storing it if missing."""
+        path = self._stage_path(name)
+        if os.path.exists(path):
+            try:
+                return joblib.load(path)
+            except Exception:
+                os.remove(path)  # Partially written or stale; recompute
+
+        result = compute()
+        os.utime(self.path)  # Mark the run as recently used for eviction
+
+        # Write to a temporary file first so an interrupted dump never looks complete
+        fd, tmp_path = tempfile.mkstemp(dir=self.path, suffix=".tmp")
+        os.close(fd)
+        try:
+            joblib.dump(result, tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return result
+
+    def clear(self):
+        shutil.rmtree(self.path, ignore_errors=True)
@@ -0,0 +1,281 @@
+import json
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
+from Back_End.timebuckets import summarize_dates
+from Back_End.instrumentation import trace
+
+pd.options.mode.copy_on_write = True
+
+
+def detect_date_columns(df):
+    """Detect columns that are likely to contain dates."""
+    date_columns = []
+    for column in df.columns:
+        if pd.api.types.is_numeric_dtype(df[column]) or pd.api.types.is_bool_dtype(df[column]):
+            continue
+        try:
+            temp = pd.to_datetime(df[column], errors='coerce')
+            if temp.notna().mean() >= 0.8:
+                date_columns.append(column)
+        except Exception:
+            continue
+    return date_columns
+
+
+def guess_date_format(series):
+    """Guess the strftime format of a date column from its first non-null value."""
+    values = series.dropna()
+    if values.empty or pd.api.types.is_datetime64_any_dtype(series):
+        return None
+    try:
+        return guess_datetime_format(str(values.iloc[0]))
+    except Exception:
+        return None
+
+
+def parse_dates(series, date_format=None):
+    """Parse a column to datetimes, using a known format as the fast path."""
+    if pd.api.types.is_datetime64_any_dtype(series):
+        return series
+    if not date_format:
+        return pd.to_datetime(series, errors='coerce')
+
+    parsed = pd.to_datetime(series, format=date_format, errors='coerce')
+    # Values in a different format than the first one fall back to inference
+    retry = parsed.isna() & series.notna()
+    if retry.any():
+        parsed[retry] = pd.to_datetime(series[retry], errors='coerce')
+    return parsed
+
+
+def normalize_dates(df, column_name, date_format=None, drop_invalid=True):
+    """Normalize dates to YYYY-MM-DD format."""
+    try:
+        df[column_name] = parse_dates(df[column_name], date_format)
+        if drop_invalid:
+            df = df.dropna(subset=[column_name])
+        df[column_name] = df[column_name].dt.strftime('%Y-%m-%d')
+        return df
+    except Exception:
+        return df
+
+
+def outlier_bounds(df, columns, method='iqr', k=None):
+    """Lower and upper bound of every numeric column, from one vectorized quantile pass.
+
+    ``iqr`` uses Q1 - k*IQR and Q3 + k*IQR (k=1.5 by default); ``mad`` uses
+    median +/- k * 1.4826 * MAD (k=3.5 by default), which costs one more pass.
+    Columns whose spread is 0 (constants, flags with a small minority) get no
+    bounds: they would collapse to one value and flag every other value.
+    """
+    numeric = df[columns].select_dtypes(include='number').select_dtypes(exclude='bool')
+    if numeric.empty:
+        return {}
+    with trace("outlier_bounds", rows=len(numeric), columns=numeric.shape[1]):
+        if method == 'mad':
+            k = 3.5 if k is None else k
+            median = numeric.median()
+            spread = 1.4826 * (numeric - median).abs().median()
+            low, high = median - k * spread, median + k * spread
+        else:
+            k = 1.5 if k is None else k
+            q1, q3 = numeric.quantile([0.25, 0.75]).to_numpy()
+            spread = pd.Series(q3 - q1, index=numeric.columns)
+            low = pd.Series(q1, index=numeric.columns) - k * spread
+            high = pd.Series(q3, index=numeric.columns) + k * spread
+    return {col: (_to_builtin(low[col]), _to_builtin(high[col]))
+            for col in numeric.columns if spread[col] > 0}
+
+
+def apply_outlier_bounds(df, bounds, action='clip'):
+    """Clip values to their bounds, or drop every row with a value outside them, in one mask."""
+    columns = [col for col in bounds if col in df.columns]
+    if not columns:
+        return df
+    low = pd.Series({col: bounds[col][0] for col in columns})
+    high = pd.Series({col: bounds[col][1] for col in columns})
+    if action == 'remove':
+        values = df[columns].to_numpy(dtype=float)
+        outside = ((values < low.to_numpy()) | (values > high.to_numpy())).any(axis=1)
+        return df[~outside]
+    df[columns] = df[columns].clip(lower=low, upper=high, axis=1)
+    return df
+
+
+def _to_builtin(value):
+    """Convert NumPy scalars to plain Python values so plans serialize as JSON."""
+    return value.item() if hasattr(value, 'item') else value
+
+
+class CleaningPlan:
+    """Cleaning rules fitted once on a dataset and replayed on new batches.
+
+    ``fit`` learns which columns are dates (their format and range), which columns
+    are dropped for missing data, whether incomplete rows are dropped, the
+    outlier bounds of numeric columns and the fill value of every remaining
+    column. ``transform`` then applies those decisions without recomputing any
+    statistics.
+
+    ``outliers`` is None (keep), ``'clip'`` or ``'remove'``; ``outlier_method``
+    is ``'iqr'`` or ``'mad'``.
+    """
+
+    def __init__(self, columns=None, drop_duplicates=True, missing_threshold=0.4, row_drop_threshold=10,
+                 outliers=None, outlier_method='iqr'):
+        self.columns = list(columns) if columns is not None else None
+        self.drop_duplicates = drop_duplicates
+        self.missing_threshold = missing_threshold
+        self.row_drop_threshold = row_drop_threshold
+        self.outliers = outliers
+        self.outlier_method = outlier_method
+
+        self.date_formats = {}
+        self.date_summaries = {}
+        self.dropped_columns = []
+        self.drop_missing_rows = False
+        self.fill_values = {}
+        self.outlier_bounds = {}
+        self.fitted = False
+
+    def _targets(self, df):
+        """Columns that get date normalization and missing-value filling."""
+        if self.columns is None:
+            return list(df.columns)
+        return [col for col in self.columns if col in df.columns]
+
+    def fit(self, df):
+        self.fit_transform(df)
+        return self
+
+    def fit_transform(self, df):
+        """Learn the cleaning rules from ``df`` and return it cleaned."""
+        if self.drop_duplicates:
+            with trace("dedup", rows=len(df)):
+                df = df.drop_duplicates()
+
+        # Detect and normalize date columns
+        with trace("date_inference", rows=len(df)):
+            date_columns = detect_date_columns(df[self._targets(df)])
+            self.date_formats = {col: guess_date_format(df[col]) for col in date_columns}
+            self.date_summaries = {}
+            for column, date_format in self.date_formats.items():
+                df = normalize_dates(df, column, date_format)
+                if column in df.columns:
+                    normalized = pd.to_datetime(df[column], format='%Y-%m-%d', errors='coerce')
+                    self.date_summaries[column] = summarize_dates(normalized)
+
+        # Drop columns with more than 40% missing data
+        missing_pct = df.isnull().mean()
+        self.dropped_columns = missing_pct[missing_pct > self.missing_threshold].index.tolist()
+        df = df.drop(columns=self.dropped_columns)
+
+        # Drop rows if less than 10% of them have missing data
+        if len(df):
+            self.drop_missing_rows = (df.isnull().any(axis=1).sum() / len(df)) * 100 < self.row_drop_threshold
+        if self.drop_missing_rows:
+            df = df.dropna()
+
+        # Clip or remove outliers before the fill values are computed
+        self.outlier_bounds = {}
+        if self.outliers:
+            self.outlier_bounds = outlier_bounds(df, self._targets(df), self.outlier_method)
+            df = apply_outlier_bounds(df, self.outlier_bounds, self.outliers)
+
+        # Fill missing values: median for numbers, mode for everything else
+        with trace("fill", rows=len(df)):
+            self.fill_values = {}
+            for column in self._targets(df):
+                values = df[column].dropna()
+                if values.empty:
+                    continue
+                if pd.api.types.is_numeric_dtype(values) and not pd.api.types.is_bool_dtype(values):
+                    self.fill_values[column] = _to_builtin(values.median())
+                else:
+                    self.fill_values[column] = _to_builtin(values.mode()[0])
+            df = self._fill(df)
+
+        self.fitted = True
+        return df
+
+    def transform(self, df, drop_rows=True):
+        """Apply the fitted rules to a new batch without recomputing statistics.
+
+        With ``drop_rows=False`` no row is removed (duplicates, unparseable
+        dates, incomplete rows and outliers are kept, outliers clipped to
+        their bounds), which keeps the output aligned with the input for scoring.
+        """
+        if not self.fitted:
+            raise ValueError("CleaningPlan must be fitted before transform.")
+
+        with trace("clean_transform", rows=len(df)):
+            return self._transform(df, drop_rows)
+
+    def _transform(self, df, drop_rows):
+        if drop_rows and self.drop_duplicates:
+            df = df.drop_duplicates()
+
+        df = df.drop(columns=[col for col in self.dropped_columns if col in df.columns])
+
+        for column, date_format in self.date_formats.items():
+            if column in df.columns:
+                df = normalize_dates(df, column, date_format, drop_invalid=drop_rows)
+
+        if drop_rows and self.drop_missing_rows:
+            df = df.dropna()
+
+        if self.outlier_bounds:
+            action = self.outliers if drop_rows else 'clip'
+            df = apply_outlier_bounds(df, self.outlier_bounds, action)
+
+        return self._fill(df)
+
+    def _fill(self, df):
+        fill_values = {col: value for col, value in self.fill_values.items() if col in df.columns}
+        if not fill_values:
+            return df
+        return df.fillna(value=fill_values)
+
+    def to_dict(self):
+        return {
+            'columns': self.columns,
+            'drop_duplicates': self.drop_duplicates,
+            'missing_threshold': self.missing_threshold,
+            'row_drop_threshold': self.row_drop_threshold,
+            'outliers': self.outliers,
+            'outlier_method': self.outlier_method,
+            'date_formats': self.date_formats,
+            'date_summaries': self.date_summaries,
+            'dropped_columns': self.dropped_columns,
+            'drop_missing_rows': bool(self.drop_missing_rows),
+            'fill_values': self.fill_values,
+            'outlier_bounds': self.outlier_bounds,
+            'fitted': self.fitted,
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        plan = cls(
+            columns=data.get('columns'),
+            drop_duplicates=data.get('drop_duplicates', True),
+            missing_threshold=data.get('missing_threshold', 0.4),
+            row_drop_threshold=data.get('row_drop_threshold', 10),
+            outliers=data.get('outliers'),
+            outlier_method=data.get('outlier_method', 'iqr'),
+        )
+        plan.date_formats = dict(data.get('date_formats', {}))
+        plan.date_summaries = dict(data.get('date_summaries', {}))
+        plan.dropped_columns = list(data.get('dropped_columns', []))
+        plan.drop_missing_rows = data.get('drop_missing_rows', False)
+        plan.fill_values = dict(data.get('fill_values', {}))
+        plan.outlier_bounds = {col: tuple(b) for col, b in data.get('outlier_bounds', {}).items()}
+        plan.fitted = data.get('fitted', True)
+        return plan
+
+    def save(self, path):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump(self.to_dict(), f, indent=2, default=str)
+
+    @classmethod
+    def load(cls, path):
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_dict(json.load(f))
@@ -0,0 +1,76 @@
+import bz2
+import gzip
+import zipfile
+from contextlib import contextmanager
+
+try:
+    import zstandard
+except ImportError:  # Optional; only needed for .zst uploads
+    zstandard = None
+
+MAGIC_NUMBERS = [
+    (b'\x1f\x8b', 'gzip'),
+    (b'BZh', 'bz2'),
+    (b'\x28\xb5\x2f\xfd', 'zstd'),
+    (b'PK\x03\x04', 'zip'),
+]
+COMPRESSED_SUFFIXES = ('.gz', '.bz2', '.zst', '.zip')
+
+
+def detect_compression(file):
+    """Name of the compression of a path or file-like object, from its magic number."""
+    if isinstance(file, (list, tuple)):
+        return None
+    try:
+        if isinstance(file, str):
+            with open(file, "rb") as f:
+                head = f.read(4)
+        else:
+            file.seek(0)
+            head = file.read(4)
+            file.seek(0)
+    except (OSError, AttributeError, ValueError):
+        return None
+    if isinstance(head, str):  # Text streams are never compressed
+        return None
+    for magic, name in MAGIC_NUMBERS:
+        if head.startswith(magic):
+            return name
+    return None
+
+
+@contextmanager
+def open_decompressed(file, compression=None):
+    """Binary stream over the decompressed content, decompressed lazily as it is read.
+
+    Used as a context manager; everything it opened is closed on exit. Zip
+    archives yield their first CSV member. Each call opens a fresh stream,
+    so callers that need to re-read (e.g. after sniffing the encoding) simply
+    open it again.
+    """
+    compression = compression or detect_compression(file)
+    if not isinstance(file, str):
+        file.seek(0)
+
+    if compression == 'gzip':
+        stream = gzip.open(file, 'rb') if isinstance(file, str) else gzip.GzipFile(fileobj=file, mode='rb')
+    elif compression == 'bz2':
+        stream = bz2.open(file, 'rb')
+    elif compression == 'zstd':
+        if zstandard is None:
+            raise ValueError("Reading .zst files requires the 'zstandard' package.")
+        source = open(file, "rb") if isinstance(file, str) else file
+        stream = zstandard.ZstdDecompressor().stream_reader(source, closefd=isinstance(file, str))
+    elif compression == 'zip':
+        # The archive is closed together with the member read from it
+        with zipfile.ZipFile(file) as archive:
+            members = [m for m in archive.namelist() if m.lower().endswith('.csv')] or archive.namelist()
+            if not members:
+                raise ValueError("The zip archive is empty.")
+            with archive.open(members[0]) as stream:
+                yield stream
+        return
+    else:
+        raise ValueError(f"Unsupported compression: {compression}")
+    with stream:
+        yield stream
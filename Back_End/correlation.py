@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+from Back_End.instrumentation import trace
+
+CORRELATION_SAMPLE_SIZE = 200000  # Rows used for the matrix on large datasets
+
+
+def compute_correlation(df, sample_size=CORRELATION_SAMPLE_SIZE, random_state=0):
+    """Pearson correlation of the numeric columns from one float32 matrix product.
+
+    Columns are centered and scaled once, so the whole matrix is a single
+    BLAS call instead of pandas' pairwise loop. Missing values are treated as
+    the column mean, and on large inputs a row sample is used.
+    """
+    numeric = df.select_dtypes(include=['number', 'bool'])
+    columns = numeric.columns
+    if numeric.empty:
+        return pd.DataFrame(index=columns, columns=columns, dtype=np.float32)
+
+    if sample_size and len(numeric) > sample_size:
+        numeric = numeric.sample(n=sample_size, random_state=random_state)
+
+    with trace("correlation", rows=len(numeric), columns=len(columns)):
+        X = numeric.to_numpy(dtype=np.float32, na_value=np.nan, copy=True)  # Modified in place below
+        X -= np.nanmean(X, axis=0)
+        X[np.isnan(X)] = 0
+
+        norms = np.sqrt(np.einsum('ij,ij->j', X, X))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            X /= norms  # Constant columns become NaN, as with DataFrame.corr
+            corr = X.T @ X
+        np.clip(corr, -1, 1, out=corr)
+        np.fill_diagonal(corr, np.where(norms > 0, 1, np.nan))
+
+    return pd.DataFrame(corr, index=columns, columns=columns)
+
+
+def correlated_pairs(corr_matrix, threshold=0.5, top_k=None):
+    """Column pairs with |corr| >= threshold, strongest first."""
+    values = corr_matrix.to_numpy()
+    rows, cols = np.triu_indices(len(values), k=1)
+    strength = np.abs(values[rows, cols])
+    strength = np.where(np.isnan(strength), -1, strength)
+
+    selected = np.flatnonzero(strength >= threshold)
+    if top_k is not None and len(selected) > top_k:
+        selected = selected[np.argpartition(-strength[selected], top_k - 1)[:top_k]]
+    selected = selected[np.argsort(-strength[selected], kind='stable')]
+
+    names = corr_matrix.columns
+    return [(names[rows[i]], names[cols[i]], float(values[rows[i], cols[i]])) for i in selected]
+
+
+def collinear_columns(corr_matrix, threshold=0.99):
+    """Columns that are nearly a linear copy of an earlier column."""
+    strength = np.nan_to_num(np.abs(corr_matrix.to_numpy()), nan=0.0)
+    duplicated = np.triu(strength >= threshold, k=1).any(axis=0)
+    return corr_matrix.columns[duplicated].tolist()
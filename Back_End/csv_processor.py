@@ -1,81 +1,53 @@
 import pandas as pd
-from Back_End import process
-import io  # To handle file-like objects from Streamlit
+from concurrent.futures import ThreadPoolExecutor
+from Back_End import pipeline
+from Back_End import resources
+from Back_End.sampling import iter_chunks
+from Back_End.instrumentation import trace
 
 pd.options.mode.copy_on_write = True
 
-def detect_date_columns(df):
-    """Detect columns that are likely to contain dates."""
-    date_columns = []
-    for column in df.columns:
-        if pd.api.types.is_numeric_dtype(df[column]) or pd.api.types.is_bool_dtype(df[column]):
-            continue
-        try:
-            temp = pd.to_datetime(df[column], errors='coerce')
-            if temp.notna().mean() >= 0.8:
-                date_columns.append(column)
-        except Exception:
-            continue
-    return date_columns
-
-def normalize_dates(df, column_name):
-    """Normalize dates to YYYY-MM-DD format."""
-    try:
-        df[column_name] = pd.to_datetime(df[column_name], errors='coerce')
-        df = df.dropna(subset=[column_name])
-        df[column_name] = df[column_name].dt.strftime('%Y-%m-%d')
-        return df
-    except Exception:
-        return df
-
-def process_file(file, columns_to_include=None, columns_to_clean=None):
-    df_result = process.read_csv_with_encoding(file)
-    
-    if isinstance(df_result, str):  # error string
-        return df_result
-    
-    # ✅ Fix: Unpack tuple properly
-    df, _ = df_result  
-
-    df = df.drop_duplicates()
-
-    df = df.replace(['NA', 'NULL', 'null'], pd.NA)
-
-    # Limit DataFrame to only selected columns before cleaning
-    if columns_to_include:
-        df = df[[col for col in columns_to_include if col in df.columns]]
-
-    # Determine which of the selected columns are date-like
-    date_columns = detect_date_columns(df)
-    clean_targets = columns_to_clean if columns_to_clean else df.columns
+PREVIEW_ROWS = 10
+PREVIEW_SAMPLE_ROWS = 5000  # Rows cleaned to produce the preview
 
-    for column in clean_targets:
-        if column not in df.columns:
-            continue
+# Full exports run here while the page draws the preview
+_export_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="csv-export")
 
-        # Normalize date columns
-        if column in date_columns:
-            df = normalize_dates(df, column)
-
-        # Fill missing values
-        if df[column].dtype == 'object' and not df[column].dropna().empty:
-            mode_value = df[column].mode()[0]
-            df.loc[1:, column] = df.loc[1:, column].fillna(mode_value)
-        elif pd.api.types.is_numeric_dtype(df[column]) and not df[column].dropna().empty:
-            median_value = df[column].median()
-            df.loc[1:, column] = df.loc[1:, column].fillna(median_value)
-
-    # Drop columns with >40% missing data
-    missing_pct = df.isnull().mean()
-    df = df.drop(columns=missing_pct[missing_pct > 0.4].index)
-
-    # Drop rows if <10% have missing data
-    if (df.isnull().any(axis=1).sum() / len(df)) * 100 < 10:
-        df = df.dropna()
-
-    # Final CSV output
-    csv_output = io.StringIO()
-    df.to_csv(csv_output, index=False)
-    csv_output.seek(0)
-
-    return csv_output
\ No newline at end of file
+def process_file(file, columns_to_include=None, columns_to_clean=None, outliers=None, on_queue=None):
+    # Parsing, cleaning and serialization overlap chunk by chunk
+    try:
+        with resources.job("clean", memory_mb=resources.estimate_memory_mb(file), on_queue=on_queue):
+            return pipeline.clean_file(file, columns_to_include, columns_to_clean, outliers=outliers)
+    except Exception as e:
+        return f"Processing error: {e}"
+
+def preview_dataframe(df, columns_to_include=None, columns_to_clean=None, outliers=None, rows=PREVIEW_ROWS, sample_rows=PREVIEW_SAMPLE_ROWS):
+    """First rows cleaned as the export cleans them, with the rules fitted on a leading sample only.
+
+    Fill values and dropped columns come from the sample, so they can differ
+    slightly from the full export.
+    """
+    clean_chunk = pipeline.ChunkCleaner(columns_to_include, columns_to_clean, outliers)
+    with trace("clean_preview", rows=min(len(df), sample_rows)):
+        return clean_chunk(df.head(sample_rows)).head(rows)
+
+def read_head(file, rows=PREVIEW_SAMPLE_ROWS):
+    """First rows of an upload, for the column picker and the preview; the export streams the whole file."""
+    try:
+        chunks = iter_chunks(file, rows, dtype=None)
+        try:
+            df = next(chunks, None)
+        finally:
+            chunks.close()
+    except Exception as e:
+        return None, f"Error reading CSV: {e}"
+    if df is None:
+        return None, "No data found in the upload."
+    return df, None
+
+def start_export(file, columns_to_include=None, columns_to_clean=None, outliers=None):
+    """Stream the full file through the cleaning pipeline on a worker thread; returns a Future.
+
+    The Future holds the cleaned CSV buffer, or an error message.
+    """
+    return _export_pool.submit(process_file, file, columns_to_include, columns_to_clean, outliers)
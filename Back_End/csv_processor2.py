@@ -1,26 +1,49 @@
 import pandas as pd
 import chardet
 import io
+import os
+import tempfile
 import numpy as np
 import matplotlib.pyplot as plt
 import seaborn as sns
+from scipy import stats
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import letter
 from reportlab.lib.utils import ImageReader
 from datetime import datetime
 from Back_End import process
+from Back_End import dataset
+from Back_End import sampling
+from Back_End import pipeline
+from Back_End import resources
+from Back_End.compression import detect_compression
+from Back_End.checkpoint import Checkpoint
+from Back_End.chart_cache import ChartCache
+from Back_End.timebuckets import bucket_counts, summarize_dates
+from Back_End.typeinference import infer_object_column
+from Back_End.instrumentation import trace
+from Back_End.correlation import compute_correlation, correlated_pairs as find_correlated_pairs
 
 pd.options.mode.copy_on_write = True
 
+MAX_ANNOTATED_COLUMNS = 20
+CHART_WIDTH, CHART_HEIGHT = 500, 250  # PDF draw box of a chart, in points
+HEATMAP_HEIGHT = 300
+CHART_DPI = 72  # One pixel per PDF point, so PNGs match the draw box exactly
+PAIR_PLOT_MAX_POINTS = 5000  # Scatter points drawn per pair plot
+HEXBIN_MIN_ROWS = 100000  # Above this, pair plots switch to a density hexbin
+
 
 def detect_encoding(file):
     try:
         if isinstance(file, str):
             with open(file, "rb") as f:
-                result = chardet.detect(f.read(100000))
+                raw_data = f.read(100000)
         else:
-            result = chardet.detect(file.read(100000))
+            raw_data = file.read(100000)
             file.seek(0)
+        with trace("encoding_detection", nbytes=len(raw_data)):
+            result = chardet.detect(raw_data)
         return result["encoding"]
     except Exception as e:
         print(f"Encoding detection error: {e}")
@@ -28,28 +51,61 @@ def detect_encoding(file):
 
 
 def read_csv_with_encoding(file, sample_size=None):
+    # Multi-file uploads and archives are read partition-parallel as one table
+    if dataset.is_dataset(file):
+        df, error = dataset.read_dataset(file)
+        if df is not None and sample_size:
+            df = df.head(sample_size)
+        return df, error
+
+    # Compressed uploads are decompressed while they are parsed
+    if detect_compression(file):
+        return process.read_single_csv(file, nrows=sample_size)
+
     detected_encoding = detect_encoding(file)
     if detected_encoding is None:
         return None, "Encoding detection failed."
     try:
-        if sample_size:
-            df = pd.read_csv(file, encoding=detected_encoding, nrows=sample_size)
-        else:
-            df = pd.read_csv(file, encoding=detected_encoding)
+        with trace("parse") as record:
+            if sample_size:
+                df = pd.read_csv(file, encoding=detected_encoding, nrows=sample_size)
+            elif isinstance(file, str):
+                # Local path: parsed from the memory-mapped file, with Arrow when available
+                df = process.read_mapped_csv(file, detected_encoding)
+                record['engine'] = 'arrow' if process.pa is not None else 'mmap'
+            else:
+                df = pd.read_csv(file, encoding=detected_encoding)
+            record['rows'] = len(df)
     except UnicodeDecodeError:
+        if not isinstance(file, str):
+            file.seek(0)
         try:
-            df = pd.read_csv(file, encoding="ISO-8859-1")
+            with trace("parse", fallback="ISO-8859-1") as record:
+                df = pd.read_csv(file, encoding="ISO-8859-1")
+                record['rows'] = len(df)
         except Exception as e:
             return None, f"Encoding Error: {e}"
 
     if df.empty or len(df.columns) == 1:
+        if not isinstance(file, str):
+            file.seek(0)
         try:
-            df = pd.read_csv(file, encoding=detected_encoding, header=None)
+            with trace("parse", fallback="no header") as record:
+                df = pd.read_csv(file, encoding=detected_encoding, header=None)
+                record['rows'] = len(df)
         except Exception as e:
             return None, f"Final Read Error: {e}"
 
     return df, None
 
+def read_quick_sample(file, sample_size):
+    """Stratified sample for a quick report, with the same headerless fallback as a full read."""
+    df, error = sampling.read_sample(file, sample_size)
+    if df is not None and (df.empty or len(df.columns) == 1):
+        with trace("parse", fallback="no header"):
+            df, error = sampling.read_sample(file, sample_size, header=None)
+    return df, error
+
 def add_table_of_contents(p):
     p.setFont("Helvetica-Bold", 18)
     p.drawString(180, 750, "Table of Contents")
@@ -71,33 +127,66 @@ def add_table_of_contents(p):
 
     p.showPage()
 
-def add_dataset_summary(df, column_types, p):
+def add_dataset_summary(df, column_types, p, sample_info=None):
     p.setFont("Helvetica-Bold", 18)
     p.drawString(180, 750, "Dataset Summary")
 
     p.setFont("Helvetica", 12)
     y = 720
-    p.drawString(50, y, f"Total Rows: {len(df)}")
-    y -= 20
-    p.drawString(50, y, f"Total Columns: {df.shape[1]}")
-    y -= 30
+    if sample_info:
+        # Counts are exact over the whole file; everything else comes from the sample
+        p.drawString(50, y, f"Total Rows: {sample_info['rows']} (exact, before cleaning)")
+        y -= 20
+        p.drawString(50, y, f"Total Columns: {df.shape[1]}")
+        y -= 20
+        p.setFont("Helvetica-Oblique", 10)
+        strata = ", ".join(sample_info['strata_columns'])
+        p.drawString(50, y, f"Quick report: sections marked (sample) use a random sample of {sample_info['sample_rows']} rows"
+                     + (f", stratified by {strata}." if strata else "."))
+        y -= 30
+    else:
+        p.drawString(50, y, f"Total Rows: {len(df)}")
+        y -= 20
+        p.drawString(50, y, f"Total Columns: {df.shape[1]}")
+        y -= 30
 
     p.setFont("Helvetica-Bold", 14)
-    p.drawString(50, y, "Column Type Distribution:")
+    p.drawString(50, y, "Column Type Distribution:" + (" (sample)" if sample_info else ""))
     y -= 20
     p.setFont("Helvetica", 12)
     for key, cols in column_types.items():
         p.drawString(70, y, f"{key.capitalize()}: {len(cols)}")
         y -= 20
 
+    if column_types.get('datetime'):
+        y -= 10
+        p.setFont("Helvetica-Bold", 14)
+        p.drawString(50, y, "Date Ranges:" + (" (sample)" if sample_info else ""))
+        y -= 20
+        p.setFont("Helvetica", 10)
+        for col in column_types['datetime']:
+            summary = summarize_dates(df[col])
+            if summary:
+                p.drawString(70, y, f"{col}: {summary['min'][:10]} to {summary['max'][:10]} (charted per {summary['resolution']})")
+                y -= 15
+                if y < 100:
+                    p.showPage()
+                    y = 750
+
     y -= 10
     p.setFont("Helvetica-Bold", 14)
-    p.drawString(50, y, "Missing Value Summary:")
+    if sample_info:
+        p.drawString(50, y, "Missing Value Summary (exact, before cleaning):")
+        nulls = pd.Series(sample_info['nulls'], dtype='int64')
+        total_rows = sample_info['rows']
+    else:
+        p.drawString(50, y, "Missing Value Summary:")
+        nulls = df.isnull().sum()
+        total_rows = len(df)
     y -= 20
     p.setFont("Helvetica", 10)
-    nulls = df.isnull().sum()
-    for col in df.columns:
-        missing_pct = 100 * nulls[col] / len(df)
+    for col in nulls.index:
+        missing_pct = 100 * nulls[col] / max(1, total_rows)
         if missing_pct > 0:
             p.drawString(70, y, f"{col}: {missing_pct:.1f}% missing")
             y -= 15
@@ -127,25 +216,19 @@ def detect_column_types(df):
         elif pd.api.types.is_datetime64_any_dtype(dtype):
             column_types['datetime'].append(col)
         elif pd.api.types.is_object_dtype(dtype):
-            try:
-                converted = pd.to_datetime(df[col], errors='raise')
+            kind, converted = infer_object_column(df[col])
+            if converted is not None:
                 df[col] = converted
-                column_types['datetime'].append(col)
-            except:
-                unique_ratio = df[col].nunique() / max(1, len(df[col]))
-                if unique_ratio < 0.5:
-                    column_types['categorical'].append(col)
-                else:
-                    column_types['text'].append(col)
+            column_types[kind].append(col)
         else:
             column_types['unsupported'].append(col)
 
     return column_types, df
 
 
-def draw_image_on_canvas(p, img_buffer, y_position, height=300):
+def draw_image_on_canvas(p, img_buffer, y_position, height=HEATMAP_HEIGHT):
     img = ImageReader(img_buffer)
-    p.drawImage(img, 50, y_position - height, width=500, height=height, preserveAspectRatio=True)
+    p.drawImage(img, 50, y_position - height, width=CHART_WIDTH, height=height, preserveAspectRatio=True)
     y_position -= (height + 20)
     if y_position < 100:
         p.showPage()
@@ -153,79 +236,191 @@ def draw_image_on_canvas(p, img_buffer, y_position, height=300):
     return y_position
 
 
-def generate_histograms(df, p, y_position):
+def chart_figure(height=CHART_HEIGHT):
+    """Open a figure sized to the box it is drawn into on the PDF page."""
+    return plt.figure(figsize=(CHART_WIDTH / 72, height / 72))
+
+
+def save_figure():
+    """Render the current pyplot figure to PNG bytes and close it."""
+    img_buffer = io.BytesIO()
+    plt.savefig(img_buffer, format='png', dpi=CHART_DPI)
+    plt.close()
+    return img_buffer.getvalue()
+
+
+def render_chart(cache, render, *args):
+    """Render a chart, reusing the cached PNG when its input columns are unchanged."""
+    with trace("chart_render", chart=render.__name__) as record:
+        if cache is None:
+            png = render(*args)
+        else:
+            png = cache.render(render, *args, params=(CHART_WIDTH, CHART_HEIGHT, CHART_DPI))
+        record['bytes'] = len(png)
+    return io.BytesIO(png)
+
+
+def render_to_cache(cache_dir, render, *args):
+    """Render one chart into the on-disk cache; runs in the chart worker processes."""
+    ChartCache(cache_dir).render(render, *args, params=(CHART_WIDTH, CHART_HEIGHT, CHART_DPI))
+
+
+def chart_jobs(df, column_types, corr_matrix, cache):
+    """Every chart of the report as (render_to_cache, args), for rendering ahead of drawing."""
+    charts = []
+    if not corr_matrix.empty:
+        charts.append((render_heatmap, (corr_matrix,)))
+    for col1, col2, corr_value in find_correlated_pairs(corr_matrix, 0.5, top_k=5):
+        charts.append((render_pair_plot, (df[col1].to_numpy(dtype=float), df[col2].to_numpy(dtype=float), col1, col2, corr_value)))
+    for col in column_types['numeric']:
+        charts.append((render_histogram, (df[col],)))
+    for col in column_types['categorical']:
+        counts = df[col].value_counts().nlargest(10)
+        if not counts.empty:
+            charts.append((render_bar_chart, (counts, col)))
+    for col in column_types['datetime']:
+        time_counts = bucket_counts(df[col])
+        if not time_counts.empty:
+            charts.append((render_time_series, (time_counts, col)))
+    return [(render_to_cache, (cache.cache_dir, render, *args)) for render, args in charts]
+
+
+def render_histogram(series):
+    chart_figure()
+    sns.histplot(series, kde=True, color='blue', bins=30)
+    plt.title(f"Histogram for {series.name}")
+    plt.tight_layout()
+    return save_figure()
+
+
+def render_bar_chart(counts, col):
+    chart_figure()
+    sns.barplot(x=counts.values, y=counts.index, palette="Set2")
+    plt.title(f"Top Categories in {col}")
+    plt.tight_layout()
+    return save_figure()
+
+
+def render_time_series(time_counts, col):
+    chart_figure()
+    # Bars sit at bucket starts on a real date axis, so decades of data stay readable
+    bucket_days = (time_counts.index[1] - time_counts.index[0]).days if len(time_counts) > 1 else 1
+    plt.bar(time_counts.index, time_counts.values, width=max(bucket_days, 1 / 24) * 0.8, align='edge')
+    plt.gcf().autofmt_xdate()
+    plt.title(f"Records Over Time in {col} (per {time_counts.name})")
+    plt.tight_layout()
+    return save_figure()
+
+
+def render_heatmap(corr_matrix):
+    chart_figure(HEATMAP_HEIGHT)
+    # Cell labels are unreadable (and slow to draw) beyond a couple dozen columns
+    annotate = len(corr_matrix.columns) <= MAX_ANNOTATED_COLUMNS
+    sns.heatmap(corr_matrix, annot=annotate, fmt='.2f', cmap='coolwarm', cbar=True)
+    plt.title("Correlation Heatmap")
+    plt.tight_layout()
+    return save_figure()
+
+
+def sample_pair(x, y, max_points=PAIR_PLOT_MAX_POINTS, strata=20, random_state=0):
+    """Pick up to max_points rows, stratified on x quantiles so the tails stay visible."""
+    if len(x) <= max_points:
+        return x, y
+    rng = np.random.default_rng(random_state)
+    edges = np.unique(np.quantile(x, np.linspace(0, 1, strata + 1)))
+    bins = np.clip(np.searchsorted(edges, x, side='right') - 1, 0, max(len(edges) - 2, 0))
+    per_stratum = max(1, max_points // (len(edges) - 1 or 1))
+
+    # Random priority per row; within each stratum keep the lowest ones
+    order = np.lexsort((rng.random(len(x)), bins))
+    starts = np.searchsorted(bins[order], np.arange(bins.max() + 1))
+    rank = np.arange(len(order)) - starts[bins[order]]
+    keep = order[rank < per_stratum]
+    return x[keep], y[keep]
+
+
+def regression_band(x, y, grid, confidence=0.95):
+    """Least-squares line and confidence band computed from summary statistics."""
+    n = len(x)
+    x_mean, y_mean = x.mean(), y.mean()
+    dx, dy = x - x_mean, y - y_mean
+    sxx, sxy, syy = dx @ dx, dx @ dy, dy @ dy
+    slope = sxy / sxx if sxx else 0.0
+    fit = y_mean + slope * (grid - x_mean)
+
+    residual_var = max(syy - slope * sxy, 0.0) / max(n - 2, 1)
+    t_value = stats.t.ppf((1 + confidence) / 2, max(n - 2, 1))
+    half_width = t_value * np.sqrt(residual_var * (1 / n + (grid - x_mean) ** 2 / (sxx or 1)))
+    return fit, fit - half_width, fit + half_width
+
+
+def render_pair_plot(x, y, col1, col2, corr_value):
+    """Scatter (or hexbin density for large n) with an analytic regression line."""
+    mask = np.isfinite(x) & np.isfinite(y)
+    x, y = x[mask], y[mask]
+
+    chart_figure()
+    if len(x) > HEXBIN_MIN_ROWS:
+        plt.hexbin(x, y, gridsize=60, bins='log', mincnt=1, cmap='Blues')
+    else:
+        sample_x, sample_y = sample_pair(x, y)
+        plt.scatter(sample_x, sample_y, s=12, alpha=0.6)
+
+    if len(x) > 2:
+        grid = np.linspace(x.min(), x.max(), 100)
+        fit, lower, upper = regression_band(x, y, grid)
+        plt.plot(grid, fit, color="red")
+        plt.fill_between(grid, lower, upper, color="red", alpha=0.15)
+
+    plt.xlabel(col1)
+    plt.ylabel(col2)
+    plt.title(f"{col1} vs {col2} (corr = {corr_value:.2f})")
+    plt.tight_layout()
+    return save_figure()
+
+
+def generate_histograms(df, p, y_position, cache=None):
     plot_count = 0
     for col in df.columns:
-        plt.figure(figsize=(10, 5))
-        sns.histplot(df[col], kde=True, color='blue', bins=30)
-        plt.title(f"Histogram for {col}")
-        plt.tight_layout()
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=100)
-        img_buffer.seek(0)
-        plt.close()
+        img_buffer = render_chart(cache, render_histogram, df[col])
         plot_count = draw_plot_with_limit(p, img_buffer, plot_count)
     return y_position
 
 
-def generate_bar_charts(df, p, y_position):
+def generate_bar_charts(df, p, y_position, cache=None):
     plot_count = 0
     for col in df.columns:
         counts = df[col].value_counts().nlargest(10)
         if counts.empty:
             continue
-        plt.figure(figsize=(10, 5))
-        sns.barplot(x=counts.values, y=counts.index, palette="Set2")
-        plt.title(f"Top Categories in {col}")
-        plt.tight_layout()
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=100)
-        img_buffer.seek(0)
-        plt.close()
+        img_buffer = render_chart(cache, render_bar_chart, counts, col)
         plot_count = draw_plot_with_limit(p, img_buffer, plot_count)
     return y_position
 
-def generate_time_series(df, p, y_position):
+def generate_time_series(df, p, y_position, cache=None):
     plot_count = 0
     for col in df.columns:
-        time_counts = df[col].dt.to_period("M").value_counts().sort_index()
+        time_counts = bucket_counts(df[col])
         if time_counts.empty:
             continue
-        plt.figure(figsize=(12, 5))
-        time_counts.plot(kind='bar')
-        plt.title(f"Records Over Time in {col}")
-        plt.tight_layout()
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=100)
-        img_buffer.seek(0)
-        plt.close()
+        img_buffer = render_chart(cache, render_time_series, time_counts, col)
         plot_count = draw_plot_with_limit(p, img_buffer, plot_count)
     return y_position
 
-def generate_correlation_heatmap(df, p, y_position):
-    corr_matrix = df.corr(numeric_only=True)
-    plt.figure(figsize=(12, 7))
-    sns.heatmap(corr_matrix, annot=True, fmt='.2f', cmap='coolwarm', cbar=True)
-    plt.title("Correlation Heatmap")
-    plt.tight_layout()
-
-    img_buffer = io.BytesIO()
-    plt.savefig(img_buffer, format='png', dpi=100)
-    img_buffer.seek(0)
-    plt.close()
-
+def generate_correlation_heatmap(df, p, y_position, cache=None, corr_matrix=None):
+    if corr_matrix is None:
+        corr_matrix = compute_correlation(df)
+    if corr_matrix.empty:
+        p.setFont("Helvetica", 10)
+        p.drawString(50, y_position, "No numeric columns available for a correlation heatmap.")
+        return y_position
+    img_buffer = render_chart(cache, render_heatmap, corr_matrix)
     return draw_image_on_canvas(p, img_buffer, y_position)
 
-def generate_correlation_pair_plots(df, p, y_position, threshold=0.5):
-    corr_matrix = df.corr(numeric_only=True)
-    upper = corr_matrix.where(np.triu(np.ones(corr_matrix.shape), k=1).astype(bool))
-
-    correlated_pairs = [
-        (row, col, upper.loc[row, col])
-        for row in upper.index
-        for col in upper.columns
-        if not pd.isna(upper.loc[row, col]) and abs(upper.loc[row, col]) >= threshold
-    ]
+def generate_correlation_pair_plots(df, p, y_position, threshold=0.5, cache=None, corr_matrix=None, title_suffix=""):
+    if corr_matrix is None:
+        corr_matrix = compute_correlation(df)
+    correlated_pairs = find_correlated_pairs(corr_matrix, threshold, top_k=5)
 
     if not correlated_pairs:
         p.setFont("Helvetica", 10)
@@ -233,19 +428,15 @@ def generate_correlation_pair_plots(df, p, y_position, threshold=0.5):
         return y_position
 
     p.setFont("Helvetica-Bold", 14)
-    p.drawString(50, y_position, f"Top Correlated Feature Pairs (|corr| ≥ {threshold})")
+    p.drawString(50, y_position, f"Top Correlated Feature Pairs (|corr| ≥ {threshold})" + title_suffix)
     y_position -= 30
 
     plot_count = 0
-    for col1, col2, corr_value in correlated_pairs[:5]:
-        plt.figure(figsize=(8, 5))
-        sns.regplot(data=df, x=col1, y=col2, line_kws={"color": "red"})
-        plt.title(f"{col1} vs {col2} (corr = {corr_value:.2f})")
-        plt.tight_layout()
-        img_buffer = io.BytesIO()
-        plt.savefig(img_buffer, format='png', dpi=100)
-        img_buffer.seek(0)
-        plt.close()
+    for col1, col2, corr_value in correlated_pairs:
+        img_buffer = render_chart(
+            cache, render_pair_plot,
+            df[col1].to_numpy(dtype=float), df[col2].to_numpy(dtype=float), col1, col2, corr_value
+        )
         plot_count = draw_plot_with_limit(p, img_buffer, plot_count)
     return y_position
 
@@ -253,23 +444,57 @@ def draw_plot_with_limit(p, img_buffer, plot_count, max_per_page=2):
     width, height = letter
     y_position = height - 300 if plot_count % max_per_page == 0 else height - 600
     img = ImageReader(img_buffer)
-    p.drawImage(img, 50, y_position, width=500, height=250)
+    p.drawImage(img, 50, y_position, width=CHART_WIDTH, height=CHART_HEIGHT)
     plot_count += 1
     if plot_count % max_per_page == 0:
         p.showPage()
     return plot_count
 
-def process_file(file, target_col=None, sample_size=None):
-    df, error = read_csv_with_encoding(file, sample_size)
+QUICK_REPORT_MEMORY_MB = 512  # Charged for a sampled report, whatever the input size
+
+def process_file(file, target_col=None, sample_size=None, quick=False, on_queue=None):
+    """Build the PDF report and return the path of its temporary file; quick
+    reports are drawn from a stratified random sample.
+
+    Inputs too large for the memory budget are downgraded to a quick report.
+    """
+    memory_mb = resources.estimate_memory_mb(file)
+    if not quick and not resources.governor.fits(memory_mb):
+        quick = True
+    if quick:
+        memory_mb = min(memory_mb, QUICK_REPORT_MEMORY_MB)
+
+    with resources.job("report", cpus=pipeline.RENDER_WORKERS + 1, memory_mb=memory_mb, on_queue=on_queue) as grant:
+        # Chart workers only run when the governor granted spare workers for them
+        return build_report(file, target_col, sample_size, quick, prerender=grant.cpus > 1)
+
+def build_report(file, target_col=None, sample_size=None, quick=False, prerender=True):
+    """Write the PDF report to a temporary file and return its path; the caller moves or removes it."""
+    # Completed stages are kept on disk so a failed run resumes where it stopped
+    checkpoint = Checkpoint(file, {'stage': 'report', 'sample_size': sample_size, 'quick': quick})
+
+    if quick:
+        df, error = checkpoint.stage('parsed', lambda: read_quick_sample(file, sample_size or sampling.QUICK_REPORT_ROWS))
+    else:
+        df, error = checkpoint.stage('parsed', lambda: read_csv_with_encoding(file, sample_size))
     if error:
+        checkpoint.clear()
         return None, error
+    sample_info = df.attrs.get('sample')
+    sampled = " (sample)" if sample_info else ""
 
+    report_path = None
     try:
-        df = process.process_file(df)
-        column_types, df = detect_column_types(df)
+        df = checkpoint.stage('cleaned', lambda: process.process_file(df))
+        column_types, df = checkpoint.stage('profile', lambda: detect_column_types(df))
+
+        # Charts are cached per input column, so re-uploads only render what changed
+        chart_cache = ChartCache()
 
-        buffer = io.BytesIO()
-        p = canvas.Canvas(buffer, pagesize=letter)
+        # The PDF is written to a file of its own run, never shared with other runs on the same input
+        fd, report_path = tempfile.mkstemp(prefix="report-", suffix=".pdf")
+        os.close(fd)
+        p = canvas.Canvas(report_path, pagesize=letter, pageCompression=1)
         width, height = letter
         y_position = height - 50
 
@@ -279,20 +504,34 @@ def process_file(file, target_col=None, sample_size=None):
         y_position -= 30
         p.setFont("Helvetica", 10)
         p.drawString(180, y_position, f"Generated on: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        if sample_info:
+            y_position -= 15
+            p.drawString(180, y_position, f"Quick report from a {sample_info['sample_rows']}-row sample of {sample_info['rows']} rows")
         p.showPage()
         y_position = height - 50
 
+        # Correlation matrix is computed once and shared by the heatmap and pair plots
+        corr_matrix = checkpoint.stage('correlation', lambda: compute_correlation(df))
+
+        # Charts render in worker processes while the summary pages are drawn
+        prerendered = pipeline.prerender_charts(chart_jobs(df, column_types, corr_matrix, chart_cache)) if prerender else []
+
         # Add table_of_contents
         add_table_of_contents(p)
-        add_dataset_summary(df, column_types, p)
+        add_dataset_summary(df, column_types, p, sample_info)
+        pipeline.wait_for_charts(prerendered)
 
         # Correlation Heatmap
-        y_position = generate_correlation_heatmap(df, p, y_position)
+        if sample_info:
+            p.setFont("Helvetica-Bold", 14)
+            p.drawString(50, y_position, "Correlation Heatmap (sample)")
+            y_position -= 20
+        y_position = generate_correlation_heatmap(df, p, y_position, chart_cache, corr_matrix)
         p.showPage()
         y_position = height - 30
 
         # Correlation Heatmap pairs
-        y_position = generate_correlation_pair_plots(df, p, y_position, threshold=0.5)
+        y_position = generate_correlation_pair_plots(df, p, y_position, threshold=0.5, cache=chart_cache, corr_matrix=corr_matrix, title_suffix=sampled)
         p.showPage()
         y_position = height - 30
 
@@ -300,32 +539,36 @@ def process_file(file, target_col=None, sample_size=None):
         # Numeric Visualizations
         if column_types['numeric']:
             p.setFont("Helvetica-Bold", 14)
-            p.drawString(50, y_position, "Numeric Column Visualizations")
+            p.drawString(50, y_position, "Numeric Column Visualizations" + sampled)
             y_position -= 30
-            y_position = generate_histograms(df[column_types['numeric']], p, y_position)
+            y_position = generate_histograms(df[column_types['numeric']], p, y_position, chart_cache)
             p.showPage()
             y_position = height - 30
 
         # Categorical Visualizations
         if column_types['categorical']:
             p.setFont("Helvetica-Bold", 14)
-            p.drawString(50, y_position, "Categorical Column Visualizations")
+            p.drawString(50, y_position, "Categorical Column Visualizations" + sampled)
             y_position -= 30
-            y_position = generate_bar_charts(df[column_types['categorical']], p, y_position)
+            y_position = generate_bar_charts(df[column_types['categorical']], p, y_position, chart_cache)
             p.showPage()
             y_position = height - 30
 
         # Date Visualizations
         if column_types['datetime']:
             p.setFont("Helvetica-Bold", 14)
-            p.drawString(50, y_position, "Date/Time Column Visualizations")
+            p.drawString(50, y_position, "Date/Time Column Visualizations" + sampled)
             y_position -= 30
-            y_position = generate_time_series(df[column_types['datetime']], p, y_position)
+            y_position = generate_time_series(df[column_types['datetime']], p, y_position, chart_cache)
 
-        p.save()
-        buffer.seek(0)
-        return buffer
+        with trace("pdf_assembly", pages=p.getPageNumber()):
+            p.save()
+        chart_cache.evict()
+        checkpoint.clear()  # Only needed to resume a failed run
+        return report_path
 
     except Exception as e:
         print(f"An error occurred: {e}")
-        return None, f"Processing error: {e}"
\ No newline at end of file
+        if report_path and os.path.exists(report_path):
+            os.remove(report_path)
+        return None, f"Processing error: {e} (completed stages were saved; retry to resume)"
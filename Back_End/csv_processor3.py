@@ -1,30 +1,44 @@
 import numpy as np
+from scipy import sparse, stats
+from sklearn.base import clone
 from sklearn.model_selection import GridSearchCV
 from sklearn.preprocessing import LabelEncoder, StandardScaler, OneHotEncoder
 from sklearn.linear_model import LogisticRegression, LinearRegression
 from sklearn.ensemble import RandomForestClassifier, RandomForestRegressor
-from sklearn.svm import SVC, SVR
+from sklearn.svm import SVC, SVR, LinearSVC, LinearSVR
 from sklearn.tree import DecisionTreeClassifier, DecisionTreeRegressor
 from sklearn.neighbors import KNeighborsClassifier, KNeighborsRegressor
 from sklearn.compose import ColumnTransformer
 from sklearn.pipeline import Pipeline
-from sklearn.metrics import mean_squared_error
 import warnings
 import sys
 import os
+import json
 import joblib
 
 sys.path.append(os.path.dirname(__file__))
 from Back_End import process
+from Back_End import resources
+from Back_End import sampling
+from Back_End.cleaning import CleaningPlan
+from Back_End.checkpoint import Checkpoint
+from Back_End.encoding import FrequencyEncoder, choose_categorical_encoding
+from Back_End.screening import FeatureScreen
+from Back_End.schema import build_schema
+from Back_End.instrumentation import trace
 
 warnings.filterwarnings('ignore')
 
+FIT_COST_BUDGET = 2e10  # Estimated operations above which a family is rerouted
+KNN_TREE_MAX_FEATURES = 30  # Ball trees stop paying off in higher dimensions
+TRAIN_MAX_CPUS = max(1, resources.CPU_BUDGET - 1)  # One worker stays free for interactive jobs
+TRAIN_SAMPLE_ROWS = 200000  # Rows a model is trained on when the file exceeds the memory budget
+SAMPLED_TRAIN_MEMORY_MB = 1024  # Charged for sampled training, whatever the input size
+
 def get_target_column(df):
     return df.columns[-1]
 
 def preprocess_data(df, target_col):
-    df = process.process_file(df)
-
     X = df.drop(columns=[target_col])
     y = df[target_col]
 
@@ -44,6 +58,7 @@ def preprocess_data(df, target_col):
         y = y_scaler.fit_transform(y.values.reshape(-1, 1)).ravel()
 
     # Identify column types
+    # Near-copies of another column are dropped later, by the feature screen
     numeric_cols = X.select_dtypes(include=[np.number]).columns.tolist()
     categorical_cols = X.select_dtypes(include=['object', 'bool']).columns.tolist()
 
@@ -52,14 +67,66 @@ def preprocess_data(df, target_col):
     if numeric_cols:
         transformers.append(('num', StandardScaler(), numeric_cols))
     if categorical_cols:
-        transformers.append(('cat', OneHotEncoder(handle_unknown='ignore'), categorical_cols))
+        # One-hot only low-cardinality columns; identifiers are dropped, the rest frequency encoded
+        encoding = choose_categorical_encoding(X[categorical_cols])
+        if encoding['onehot']:
+            transformers.append(('cat', OneHotEncoder(handle_unknown='ignore'), encoding['onehot']))
+        if encoding['frequency']:
+            transformers.append(('freq', FrequencyEncoder(), encoding['frequency']))
 
     preprocessor = ColumnTransformer(transformers)
     X_processed = preprocessor.fit_transform(X)
 
     return X_processed, y, task_type, y_scaler, preprocessor, y_original
 
-def train_and_evaluate_models(X, y, task_type, y_original=None, y_scaler=None):
+def fit_grid(model, param_grid, X, y, task_type, n_jobs=-1):
+    # Families are compared on their folds; only the winner is refitted on all rows
+    grid = GridSearchCV(model, param_grid, cv=5, scoring='neg_root_mean_squared_error' if task_type == 'regression' else 'accuracy', n_jobs=n_jobs, refit=False)
+    with trace("cv_fit", rows=X.shape[0], model=type(model).__name__, features=X.shape[1]):
+        grid.fit(X, y)
+    return grid
+
+def estimate_fit_cost(name, n_rows, n_features, density=1.0):
+    """Rough operation count of a cross-validated search for one model family."""
+    active_features = max(n_features * density, 1)
+    if name in ('SVM', 'K-Nearest Neighbors'):
+        # Kernel SVM fitting and brute-force neighbour scoring both grow with rows squared
+        return n_rows ** 2 * active_features
+    return n_rows * max(np.log2(max(n_rows, 2)), 1) * active_features
+
+def route_models(models, param_grids, X, task_type):
+    """Swap or skip model families whose estimated cost exceeds the budget."""
+    n_rows, n_features = X.shape
+    density = X.nnz / max(n_rows * n_features, 1) if sparse.issparse(X) else 1.0
+
+    routing = {}
+    for name, model in models.items():
+        if model is None:
+            continue
+        cost = estimate_fit_cost(name, n_rows, n_features, density)
+        decision = 'full'
+
+        if cost > FIT_COST_BUDGET and name == 'SVM':
+            # Linear SVM scales linearly in rows; the kernel grid is dropped
+            models[name] = LinearSVC(dual='auto') if task_type == 'classification' else LinearSVR(dual='auto')
+            param_grids[name] = {'C': [0.1, 1, 10]}
+            decision = 'replaced with linear SVM'
+        elif cost > FIT_COST_BUDGET and name == 'K-Nearest Neighbors':
+            if not sparse.issparse(X) and n_features <= KNN_TREE_MAX_FEATURES:
+                models[name].set_params(algorithm='ball_tree')
+                decision = 'ball-tree neighbours'
+            else:
+                models[name] = None
+                decision = 'skipped (too many rows for high-dimensional neighbours)'
+
+        routing[name] = {
+            'estimator': type(models[name]).__name__ if models[name] is not None else None,
+            'estimated_cost': float(cost),
+            'decision': decision,
+        }
+    return models, param_grids, routing
+
+def train_and_evaluate_models(X, y, task_type, y_original=None, y_scaler=None, checkpoint=None, n_jobs=-1):
     models = {
         'Logistic Regression': LogisticRegression() if task_type == 'classification' else None,
         'Random Forest': RandomForestClassifier() if task_type == 'classification' else RandomForestRegressor(),
@@ -76,10 +143,11 @@ def train_and_evaluate_models(X, y, task_type, y_original=None, y_scaler=None):
         'K-Nearest Neighbors': {'n_neighbors': [3, 5, 7]}
     }
 
-    best_model = None
-    best_score = -np.inf
-    best_model_name = None
-    best_params = None
+    # Slow families are swapped for scalable equivalents or skipped on large inputs
+    models, param_grids, routing = route_models(models, param_grids, X, task_type)
+
+    leaderboard = []
+    best_params = {}
 
     for name, model in models.items():
         if model is None:
@@ -87,52 +155,134 @@ def train_and_evaluate_models(X, y, task_type, y_original=None, y_scaler=None):
 
         print(f"Training model: {name}")
 
-        grid = GridSearchCV(model, param_grids.get(name, {}), cv=5, scoring='neg_root_mean_squared_error' if task_type == 'regression' else 'accuracy', n_jobs=-1)
-        grid.fit(X, y)
-        model = grid.best_estimator_
-
-        if task_type == 'classification':
-            score = grid.best_score_
+        # Fitted searches are checkpointed per family so a failed run resumes after the last one
+        if checkpoint is not None:
+            grid = checkpoint.stage(f"grid_{name}_{type(model).__name__}", lambda: fit_grid(model, param_grids.get(name, {}), X, y, task_type, n_jobs))
         else:
-            predictions = model.predict(X)
-            if y_scaler is not None:
-                y_real = y_scaler.inverse_transform(y.reshape(-1, 1))
-                pred_real = y_scaler.inverse_transform(predictions.reshape(-1, 1))
-                rmse = mean_squared_error(y_real, pred_real, squared=False)
-                std_real = np.std(y_real)
-                score = max(0, 1 - (rmse / std_real))  # Regression accuracy
-            else:
-                score = 0
+            grid = fit_grid(model, param_grids.get(name, {}), X, y, task_type, n_jobs)
 
-        if score > best_score:
-            best_score = score
-            best_model = model
-            best_model_name = name
-            best_params = grid.best_params_ if param_grids.get(name) else None
+        best_params[name] = grid.best_params_
+        leaderboard.append(leaderboard_entry(name, grid, task_type, y, bool(param_grids.get(name))))
 
-    return best_model, best_model_name, best_score, best_params
+    # Families are ranked on their held-out fold scores, never on training predictions
+    leaderboard.sort(key=lambda entry: entry['score'], reverse=True)
+    best = leaderboard[0]
 
-def process_file(file, task_type=None):
-    df, error = process.read_csv_with_encoding(file)
+    with trace("refit", rows=X.shape[0], model=best['model']):
+        best_model = clone(models[best['model']]).set_params(**best_params[best['model']]).fit(X, y)
+
+    model_info = {'routing': routing, 'leaderboard': leaderboard}
+    return best_model, best['model'], best['score'], best['params'], model_info
+
+def leaderboard_entry(name, grid, task_type, y, tuned=True, confidence=0.95):
+    """Score, confidence interval and timings of a family from its CV folds."""
+    results = grid.cv_results_
+    index = grid.best_index_
+    fold_scores = np.array([results[f"split{i}_test_score"][index] for i in range(grid.n_splits_)])
+
+    if task_type == 'regression':
+        # Folds report -RMSE on the standardized target; convert to 1 - RMSE/std
+        fold_scores = np.maximum(0, 1 - (-fold_scores) / (np.std(y) or 1))
+
+    n_folds = len(fold_scores)
+    half_width = stats.t.ppf((1 + confidence) / 2, n_folds - 1) * fold_scores.std(ddof=1) / np.sqrt(n_folds) if n_folds > 1 else 0.0
+
+    return {
+        'model': name,
+        'score': float(fold_scores.mean()),
+        'ci_low': float(fold_scores.mean() - half_width),
+        'ci_high': float(fold_scores.mean() + half_width),
+        'fit_time': float(results['mean_fit_time'][index]),
+        'predict_time': float(results['mean_score_time'][index]),
+        'params': grid.best_params_ if tuned else None,
+    }
+
+def screen_features(X, y, task_type, preprocessor):
+    """Drop constant, collinear and (over budget) low-scoring features before the search."""
+    try:
+        feature_names = preprocessor.get_feature_names_out()
+    except Exception:
+        feature_names = None
+    screen = FeatureScreen(task_type=task_type, feature_names=feature_names).fit(X, y)
+    return screen, screen.transform(X)
+
+def model_info_path(model_filename):
+    return os.path.splitext(model_filename)[0] + "_info.json"
+
+def load_model_info(model_filename):
+    """Leaderboard, routing and screening of a trained model, read from its JSON sidecar."""
+    try:
+        with open(model_info_path(model_filename), "r", encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+def fit_cleaning_plan(df, target_col, outliers=None):
+    """Fit the cleaning rules on the feature columns; the target is never filled or clipped."""
+    features = [col for col in df.columns if col != target_col]
+    cleaning_plan = CleaningPlan(columns=features, outliers=outliers)
+    df = cleaning_plan.fit_transform(df)
+    # Rows without a target cannot be learned from
+    df = df.dropna(subset=[target_col])
+    return cleaning_plan, df
+
+def process_file(file, task_type=None, model_filename="best_model.pkl", outliers=None, on_queue=None):
+    # Admitted through the shared governor; the grid searches use only the granted workers
+    memory_mb = resources.estimate_memory_mb(file)
+    sample_size = None
+    if not resources.governor.fits(memory_mb):
+        # Too large to load whole: the model is trained on a stratified random sample
+        sample_size = TRAIN_SAMPLE_ROWS
+        memory_mb = min(memory_mb, SAMPLED_TRAIN_MEMORY_MB)
+    with resources.job("train", cpus=TRAIN_MAX_CPUS, memory_mb=memory_mb, on_queue=on_queue) as grant:
+        return train_file(file, task_type, model_filename, outliers, n_jobs=grant.cpus, sample_size=sample_size)
+
+def read_training_data(file, sample_size=None):
+    if sample_size:
+        return sampling.read_sample(file, sample_size)
+    return process.read_csv_with_encoding(file)
+
+def train_file(file, task_type=None, model_filename="best_model.pkl", outliers=None, n_jobs=-1, sample_size=None):
+    checkpoint = Checkpoint(file, {'stage': 'train', 'outliers': outliers, 'sample_size': sample_size})
+
+    df, error = checkpoint.stage('parsed', lambda: read_training_data(file, sample_size))
     if error:
+        checkpoint.clear()
         return error
+    sample_info = df.attrs.get('sample')
 
     target_col = get_target_column(df)
-    X, y, task_type, y_scaler, preprocessor, y_original = preprocess_data(df, target_col)
-    best_model, best_model_name, best_score, best_params = train_and_evaluate_models(X, y, task_type, y_original, y_scaler)
+
+    # Fit the cleaning rules once so scoring can replay them (outlier bounds included) on new files
+    cleaning_plan, df = checkpoint.stage('cleaned', lambda: fit_cleaning_plan(df, target_col, outliers))
+
+    X, y, task_type, y_scaler, preprocessor, y_original = checkpoint.stage('preprocessed', lambda: preprocess_data(df, target_col))
+    # Every model family is searched on the screened features only
+    screen, X = checkpoint.stage('screened', lambda: screen_features(X, y, task_type, preprocessor))
+    best_model, best_model_name, best_score, best_params, model_info = train_and_evaluate_models(X, y, task_type, y_original, y_scaler, checkpoint, n_jobs)
+    model_info['screening'] = screen.report_
+    if sample_info:
+        model_info['training_sample'] = {'rows': sample_info['rows'], 'sample_rows': sample_info['sample_rows']}
 
     pipeline = Pipeline([
         ('preprocessor', preprocessor),
+        ('screen', screen),
         ('model', best_model)
     ])
 
-    model_filename = "best_model.pkl"
     model_package = {
         'pipeline': pipeline,
         'y_scaler': y_scaler,
-        'task_type': task_type
+        'task_type': task_type,
+        'cleaning_plan': cleaning_plan.to_dict(),
+        'schema': build_schema(df.drop(columns=[target_col])),
+        'model_info': model_info
     }
 
     joblib.dump(model_package, model_filename)
+    # The leaderboard is also kept as JSON, so pages can show it without unpickling the model
+    with open(model_info_path(model_filename), "w", encoding="utf-8") as f:
+        json.dump(model_info, f, indent=2, default=str)
+    checkpoint.clear()  # Only needed to resume a failed run
 
     return model_filename, best_model_name, best_score, best_params
\ No newline at end of file
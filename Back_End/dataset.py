@@ -0,0 +1,127 @@
+import os
+import zipfile
+from contextlib import ExitStack, nullcontext
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from Back_End import process
+from Back_End.instrumentation import trace
+
+pd.options.mode.copy_on_write = True
+
+MAX_WORKERS = min(8, os.cpu_count() or 1)
+
+
+def source_name(source):
+    return source if isinstance(source, str) else getattr(source, 'name', '')
+
+
+def is_dataset(file):
+    """True for inputs holding several partitions: lists of files and zip archives."""
+    if isinstance(file, (list, tuple)):
+        return True
+    if source_name(file).lower().endswith('.zip'):
+        return True
+    try:
+        return zipfile.is_zipfile(file)
+    except Exception:
+        return False
+    finally:
+        if not isinstance(file, str):
+            file.seek(0)
+
+
+def list_partitions(sources, archives):
+    """Expand files and archives into (name, opener) pairs, one per CSV partition.
+
+    Zip archives are opened on ``archives`` (an ExitStack) and closed with it.
+    Each opener returns a context manager over its partition; only the
+    partitions opened here are closed on exit, never the caller's files.
+    """
+    if not isinstance(sources, (list, tuple)):
+        sources = [sources]
+
+    partitions = []
+    for source in sources:
+        name = source_name(source)
+        if not isinstance(source, str):
+            source.seek(0)
+
+        if zipfile.is_zipfile(source):
+            if not isinstance(source, str):
+                source.seek(0)
+            archive = archives.enter_context(zipfile.ZipFile(source))
+            for member in archive.namelist():
+                if member.lower().endswith('.csv'):
+                    partitions.append((f"{name}:{member}", lambda a=archive, m=member: a.open(m)))
+        else:
+            # Plain or gzip/bz2/zstd compressed CSV; decompressed while it is parsed
+            partitions.append((name, lambda s=source: nullcontext(s)))
+    return partitions
+
+
+def read_partition(name, opener):
+    """Read one partition with its own encoding detection and compute its statistics."""
+    with opener() as file:
+        if not isinstance(file, str):
+            file.seek(0)
+        df, error = process.read_single_csv(file)
+    if error:
+        return None, None, f"{name}: {error}"
+    stats = {
+        'partition': name,
+        'rows': len(df),
+        'columns': list(df.columns),
+        'dtypes': {col: str(dtype) for col, dtype in df.dtypes.items()},
+        'nulls': df.isnull().sum().to_dict(),
+    }
+    return df, stats, None
+
+
+def reconcile_dtypes(frames):
+    """Give every column one dtype across partitions before they are concatenated."""
+    columns = {}
+    for df in frames:
+        for col, dtype in df.dtypes.items():
+            columns.setdefault(col, set()).add(dtype)
+
+    targets = {}
+    for col, dtypes in columns.items():
+        if len(dtypes) == 1:
+            continue
+        if all(pd.api.types.is_numeric_dtype(d) or pd.api.types.is_bool_dtype(d) for d in dtypes):
+            targets[col] = 'float64'
+        else:
+            targets[col] = 'object'
+
+    return [df.astype({col: t for col, t in targets.items() if col in df.columns}) for df in frames]
+
+
+def read_dataset(sources, max_workers=MAX_WORKERS):
+    """Read many CSV partitions in parallel as one logical table.
+
+    Accepts a list of paths or file-like objects (each plain or compressed)
+    or a zip archive of CSVs. Encoding, schema and per-partition statistics are
+    computed independently for each partition; partition statistics are kept
+    in ``df.attrs['partitions']``.
+    """
+    with ExitStack() as archives:
+        try:
+            partitions = list_partitions(sources, archives)
+        except Exception as e:
+            return None, f"Error opening dataset: {e}"
+        if not partitions:
+            return None, "No CSV files found in the upload."
+
+        with trace("dataset_read", partitions=len(partitions)) as record:
+            with ThreadPoolExecutor(max_workers=max_workers) as pool:
+                results = list(pool.map(lambda p: read_partition(*p), partitions))
+
+            errors = [error for _, _, error in results if error]
+            if errors:
+                return None, "; ".join(errors)
+
+            frames = reconcile_dtypes([df for df, _, _ in results])
+            df = pd.concat(frames, ignore_index=True)
+            df.attrs['partitions'] = [stats for _, stats, _ in results]
+            record['rows'] = len(df)
+    return df, None
@@ -0,0 +1,45 @@
+import numpy as np
+import pandas as pd
+from sklearn.base import BaseEstimator, TransformerMixin
+
+ONE_HOT_MAX_CATEGORIES = 20  # Above this, categories are frequency encoded
+IDENTIFIER_RATIO = 0.95  # Columns this close to all-unique are row identifiers
+
+
+class FrequencyEncoder(BaseEstimator, TransformerMixin):
+    """Encode each category as its relative frequency in the training data.
+
+    Produces one column per input column whatever the cardinality; categories
+    unseen during fit are encoded as 0.
+    """
+
+    def fit(self, X, y=None):
+        X = pd.DataFrame(X)
+        self.feature_names_in_ = np.asarray(X.columns, dtype=object)
+        self.frequencies_ = {col: X[col].value_counts(normalize=True).to_dict() for col in X.columns}
+        return self
+
+    def transform(self, X):
+        X = pd.DataFrame(X, columns=self.feature_names_in_) if not isinstance(X, pd.DataFrame) else X
+        encoded = [
+            X[col].map(self.frequencies_[col]).astype(float).fillna(0).to_numpy()
+            for col in self.feature_names_in_
+        ]
+        return np.column_stack(encoded) if encoded else np.empty((len(X), 0))
+
+    def get_feature_names_out(self, input_features=None):
+        return np.asarray([f"{col}_freq" for col in self.feature_names_in_], dtype=object)
+
+
+def choose_categorical_encoding(X, max_categories=ONE_HOT_MAX_CATEGORIES, identifier_ratio=IDENTIFIER_RATIO):
+    """Split categorical columns by cardinality into one-hot, frequency and dropped."""
+    encoding = {'onehot': [], 'frequency': [], 'dropped': []}
+    for col in X.columns:
+        n_unique = X[col].nunique()
+        if n_unique <= max_categories:
+            encoding['onehot'].append(col)
+        elif n_unique >= identifier_ratio * X[col].notna().sum():
+            encoding['dropped'].append(col)
+        else:
+            encoding['frequency'].append(col)
+    return encoding
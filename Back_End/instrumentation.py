@@ -0,0 +1,86 @@
+import json
+import logging
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Not available on Windows
+    resource = None
+
+PERF_LOG = os.environ.get("MYCSV_PERF_LOG")  # JSON-lines file; unset keeps records in memory only
+MAX_RECORDS = 5000
+
+logger = logging.getLogger("mycsv.perf")
+_records = deque(maxlen=MAX_RECORDS)
+_lock = threading.Lock()
+
+if PERF_LOG and not logger.handlers:
+    _handler = logging.FileHandler(PERF_LOG, encoding="utf-8")
+    _handler.setFormatter(logging.Formatter("%(message)s"))
+    logger.addHandler(_handler)
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+
+
+def rss_mb():
+    """Current resident set size of this process in MB, or None where unsupported."""
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE") / (1024 * 1024)
+    except (OSError, ValueError, AttributeError):  # Not Linux
+        return None
+
+
+def peak_rss_mb():
+    """Peak resident set size of this process in MB, or None where unsupported."""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return peak / (1024 * 1024) if os.uname().sysname == "Darwin" else peak / 1024
+
+
+@contextmanager
+def trace(stage, rows=None, nbytes=None, **fields):
+    """Record wall time, CPU time, memory and volume of one pipeline stage.
+
+    Memory is attributed to the stage as ``rss_delta_mb``, the resident set
+    kept after the stage minus the one before it, and ``peak_growth_mb``, how
+    far the stage raised the process peak (0 when it stayed below an earlier
+    peak). Stages running in other threads at the same time are included.
+
+    The yielded dict can be updated inside the block, e.g. to set ``rows``
+    once they are known.
+    """
+    record = {'stage': stage, 'rows': rows, 'bytes': nbytes, **fields}
+    rss_start, peak_start = rss_mb(), peak_rss_mb()
+    wall_start, cpu_start = time.perf_counter(), time.process_time()
+    try:
+        yield record
+    except Exception as e:
+        record['error'] = str(e)
+        raise
+    finally:
+        record['wall_s'] = round(time.perf_counter() - wall_start, 6)
+        record['cpu_s'] = round(time.process_time() - cpu_start, 6)
+        rss_end, peak_end = rss_mb(), peak_rss_mb()
+        record['rss_delta_mb'] = round(rss_end - rss_start, 3) if rss_start is not None and rss_end is not None else None
+        record['peak_growth_mb'] = round(peak_end - peak_start, 3) if peak_start is not None else None
+        record['timestamp'] = time.time()
+        with _lock:
+            _records.append(record)
+        logger.info(json.dumps(record, default=str))
+
+
+def get_records():
+    with _lock:
+        return list(_records)
+
+
+def clear_records():
+    with _lock:
+        _records.clear()
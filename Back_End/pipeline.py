@@ -0,0 +1,183 @@
+"""Asyncio pipelines that overlap the stages of a Cleaner or Visualize request.
+
+Cleaning streams the file in chunks through three stages connected by bounded
+queues: parsing chunk k+1, cleaning chunk k and serializing (or collecting)
+chunk k-1 run at the same time on worker threads, so a request takes about
+as long as its slowest stage. Report charts are rendered in a process pool while the PDF
+summary pages are drawn.
+"""
+import asyncio
+import io
+import multiprocessing
+import os
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, wait
+import numpy as np
+import pandas as pd
+from Back_End.cleaning import CleaningPlan
+from Back_End.sampling import iter_chunks, read_sample
+from Back_End.instrumentation import trace
+
+pd.options.mode.copy_on_write = True
+
+CHUNK_ROWS = 250000  # Files up to this size are cleaned exactly as in one piece
+QUEUE_DEPTH = 2  # Chunks buffered between two stages
+PLAN_SAMPLE_ROWS = CHUNK_ROWS  # Rows the cleaning plan of a multi-chunk file is fitted on
+RENDER_WORKERS = int(os.environ.get("MYCSV_RENDER_WORKERS", min(4, os.cpu_count() or 1)))  # 0 renders inline
+PRERENDER_MIN_CHARTS = 6  # Fewer charts render faster inline than the pool starts
+
+_stage_pool = ThreadPoolExecutor(max_workers=3, thread_name_prefix="pipeline")
+_render_pool = None
+
+
+def render_pool():
+    """Process pool for chart rendering, started on first use and kept for later requests."""
+    global _render_pool
+    if _render_pool is None:
+        # Spawned, not forked: the parent may be a multithreaded Streamlit server
+        _render_pool = ProcessPoolExecutor(max_workers=RENDER_WORKERS, mp_context=multiprocessing.get_context("spawn"))
+    return _render_pool
+
+
+class ChunkCleaner:
+    """Cleans consecutive chunks as one table.
+
+    The plan is fitted on the first chunk when the file is a single chunk
+    (exactly as a one-piece clean); larger files first fit it on a random
+    sample of the whole file with ``fit_sample``. Duplicates are found across
+    chunks by row hash, kept in a sorted array of 8 bytes per distinct row.
+    """
+
+    def __init__(self, columns_to_include=None, columns_to_clean=None, outliers=None):
+        self.columns_to_include = columns_to_include
+        self.plan = CleaningPlan(columns=columns_to_clean or None, drop_duplicates=False, outliers=outliers)
+        self.seen = np.empty(0, dtype=np.uint64)
+        self.dtypes = None
+
+    def prepare(self, chunk):
+        chunk = chunk.replace(['NA', 'NULL', 'null'], pd.NA)
+        if self.columns_to_include:
+            chunk = chunk[[col for col in self.columns_to_include if col in chunk.columns]]
+        return chunk
+
+    def fit_sample(self, file, sample_rows=PLAN_SAMPLE_ROWS):
+        """Fit the plan on a stratified random sample of the whole file (one extra streaming pass)."""
+        sample, error = read_sample(file, sample_rows)
+        if error:
+            raise ValueError(error)
+        with trace("plan_fit", rows=len(sample)):
+            self.plan.fit(self.prepare(sample))
+
+    def drop_seen(self, chunk):
+        hashes = pd.util.hash_pandas_object(chunk, index=False).to_numpy()
+        first = ~pd.Series(hashes).duplicated().to_numpy()
+        if len(self.seen):
+            positions = np.minimum(np.searchsorted(self.seen, hashes), len(self.seen) - 1)
+            first &= self.seen[positions] != hashes
+        # Both parts are sorted, so the stable sort only merges two runs
+        self.seen = np.sort(np.concatenate([self.seen, np.sort(hashes[first])]), kind='stable')
+        return chunk[first]
+
+    def __call__(self, chunk):
+        chunk = self.prepare(self.drop_seen(chunk))
+        chunk = self.plan.transform(chunk) if self.plan.fitted else self.plan.fit_transform(chunk)
+        if self.dtypes is None:
+            self.dtypes = chunk.dtypes
+            return chunk
+
+        # A chunk without nulls parses integers where the first chunk had floats
+        widen = {col: dtype for col, dtype in self.dtypes.items()
+                 if col in chunk.columns and pd.api.types.is_float_dtype(dtype)
+                 and pd.api.types.is_integer_dtype(chunk[col].dtype)}
+        return chunk.astype(widen) if widen else chunk
+
+
+async def run_stages(*stages):
+    """Run pipeline stages together; the first failure cancels the others and is raised.
+
+    Without the cancellation a stage blocked on a full queue would wait
+    forever for a consumer that already stopped.
+    """
+    tasks = [asyncio.ensure_future(stage()) for stage in stages]
+    try:
+        done, _ = await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+    finally:
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    for task in done:
+        task.result()
+
+
+async def clean_chunks_async(file, write, columns_to_include=None, columns_to_clean=None, chunksize=CHUNK_ROWS, outliers=None):
+    """Parse and clean a CSV chunk by chunk, handing each cleaned chunk to ``write(chunk, first)``.
+
+    Parsing, cleaning and ``write`` run on worker threads with the stages overlapped.
+    """
+    loop = asyncio.get_running_loop()
+    parsed, cleaned = asyncio.Queue(QUEUE_DEPTH), asyncio.Queue(QUEUE_DEPTH)
+    clean_chunk = ChunkCleaner(columns_to_include, columns_to_clean, outliers)
+
+    async def parse():
+        chunks = iter_chunks(file, chunksize, dtype=None)
+        first = await loop.run_in_executor(_stage_pool, next, chunks, None)
+        second = await loop.run_in_executor(_stage_pool, next, chunks, None) if first is not None else None
+        if second is None:
+            chunks.close()
+            chunks = iter([first] if first is not None else [])
+        else:
+            # More than one chunk: the plan comes from a sample of the whole file, then streaming restarts
+            chunks.close()
+            await loop.run_in_executor(_stage_pool, clean_chunk.fit_sample, file)
+            chunks = iter_chunks(file, chunksize, dtype=None)
+        while (chunk := await loop.run_in_executor(_stage_pool, next, chunks, None)) is not None:
+            await parsed.put(chunk)
+        await parsed.put(None)
+
+    async def clean():
+        while (chunk := await parsed.get()) is not None:
+            await cleaned.put(await loop.run_in_executor(_stage_pool, clean_chunk, chunk))
+        await cleaned.put(None)
+
+    async def consume():
+        first = True
+        while (chunk := await cleaned.get()) is not None:
+            await loop.run_in_executor(_stage_pool, write, chunk, first)
+            first = False
+
+    await run_stages(parse, clean, consume)
+
+
+def clean_file(file, columns_to_include=None, columns_to_clean=None, chunksize=CHUNK_ROWS, outliers=None):
+    """Clean a CSV through the pipeline, serializing chunk by chunk; returns the cleaned CSV buffer."""
+    csv_output = io.StringIO()
+
+    def write(chunk, first):
+        chunk.to_csv(csv_output, index=False, header=first)
+
+    with trace("clean_pipeline") as record:
+        asyncio.run(clean_chunks_async(file, write, columns_to_include, columns_to_clean, chunksize, outliers))
+        record['bytes'] = len(csv_output.getvalue())
+    csv_output.seek(0)
+    return csv_output
+
+
+def prerender_charts(jobs):
+    """Start rendering charts in the process pool; returns futures to wait on.
+
+    ``jobs`` are ``(function, args)`` pairs; the functions store their output
+    where the drawing code finds it (the chart cache).
+    """
+    if RENDER_WORKERS < 1 or len(jobs) < PRERENDER_MIN_CHARTS:
+        return []
+    try:
+        pool = render_pool()
+        return [pool.submit(function, *args) for function, args in jobs]
+    except Exception:
+        return []  # Charts are then rendered inline as they are drawn
+
+
+def wait_for_charts(futures):
+    """Block until prerendered charts are done; failed ones are rendered inline later."""
+    if futures:
+        with trace("chart_prerender", charts=len(futures)):
+            wait(futures)
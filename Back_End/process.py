@@ -1,11 +1,23 @@
-import streamlit as st
 import base64
+import mmap
 import pandas as pd
 import chardet
+from Back_End.cleaning import CleaningPlan
+from Back_End.instrumentation import trace
+from Back_End.compression import detect_compression, open_decompressed
+
+try:
+    import pyarrow as pa
+    from pyarrow import csv as pa_csv
+except ImportError:  # Optional; memory-mapped reads fall back to the pandas parser
+    pa = None
 
 pd.options.mode.copy_on_write = True
 
+SNIFF_BYTES = 100000
+
 def set_bg_image(image_file):
+    import streamlit as st  # Imported here so headless entry points (batch CLI, benchmarks) never load it
     try:
         with open(image_file, "rb") as img_file:
             base64_str = base64.b64encode(img_file.read()).decode()
@@ -21,73 +33,40 @@ def set_bg_image(image_file):
     except FileNotFoundError:
         st.warning("Background image not found. Make sure 'Background.png' exists.")
 
-def detect_date_columns(df):
-    """Detect columns that are likely to contain dates."""
-    date_columns = []
-    for column in df.columns:
-        if pd.api.types.is_numeric_dtype(df[column]) or pd.api.types.is_bool_dtype(df[column]):
-            continue
-        try:
-            temp = pd.to_datetime(df[column], errors='coerce')
-            if temp.notna().mean() >= 0.8:
-                date_columns.append(column)
-        except Exception:
-            continue
-    return date_columns
-
-def normalize_dates(df, column_name):
-    """Normalize dates to YYYY-MM-DD format."""
-    try:
-        df[column_name] = pd.to_datetime(df[column_name], errors='coerce')
-        df = df.dropna(subset=[column_name])
-        df[column_name] = df[column_name].dt.strftime('%Y-%m-%d')
-        return df
-    except Exception:
-        return df
+def queue_status():
+    """Callback for resources.job that shows the job's place in the queue on the page."""
+    import streamlit as st
+    placeholder = st.empty()
+
+    def on_queue(position):
+        placeholder.info(f"⏳ The server is busy: your job is number {position} in the queue.")
+
+    on_queue.clear = placeholder.empty
+    return on_queue
 
 def process_file(df):
 
     if isinstance(df, str):  # If df is a string, it means an error occurred
         return df
 
-    # Drop duplicate rows
-    df = df.drop_duplicates()
-
-    # Detect and normalize date columns
-    date_columns = detect_date_columns(df)
-    for date_column in date_columns:
-        df = normalize_dates(df, date_column)
-
-    # Drop columns with more than 40% missing data
-    missing_percentage = df.isnull().mean()
-    df = df.drop(columns=missing_percentage[missing_percentage > 0.4].index)
-
-    # Drop rows with excessive missing values
-    if (df.isnull().any(axis=1).sum() / len(df)) * 100 < 10:
-        df = df.dropna()
-
-    # Fill missing values: mode for text, median for numbers
-    for column in df.columns:
-        if df[column].dtype == 'object' and not df[column].dropna().empty:
-            mode_value = df[column].mode()[0]
-            df.loc[1:, column] = df.loc[1:, column].fillna(mode_value)
-        elif pd.api.types.is_numeric_dtype(df[column]) and not df[column].dropna().empty:
-            median_value = df[column].median()
-            df.loc[1:, column] = df.loc[1:, column].fillna(median_value)
-
-    return df
+    # Drop duplicates, normalize dates, drop sparse columns/rows and fill the rest
+    return CleaningPlan().fit_transform(df)
 
 def detect_encoding(file):
     """Detects encoding of a file-like object or file path."""
     try:
-        if isinstance(file, str):  # File path
-            with open(file, "rb") as f:
-                raw_data = f.read(100000)
+        compression = detect_compression(file)
+        if compression:  # Sniff the decompressed prefix, not the compressed bytes
+            with open_decompressed(file, compression) as stream:
+                raw_data = stream.read(SNIFF_BYTES)
+        elif isinstance(file, str):  # File path; sniff the mapped prefix
+            raw_data = read_mapped_prefix(file)
         else:  # File-like object
-            raw_data = file.read(100000)
+            raw_data = file.read(SNIFF_BYTES)
             file.seek(0)  # Reset stream for later use
 
-        result = chardet.detect(raw_data)
+        with trace("encoding_detection", nbytes=len(raw_data)):
+            result = chardet.detect(raw_data)
         encoding = result.get("encoding")
 
         if encoding is None or result.get("confidence", 0) < 0.5:
@@ -99,7 +78,15 @@ def detect_encoding(file):
 
 
 def read_csv_with_encoding(file):
-    """Reads a CSV with encoding detection and error handling."""
+    """Reads a CSV, or a multi-file dataset, with encoding detection and error handling."""
+    from Back_End import dataset  # Imported here; dataset reads each partition through this module
+    if dataset.is_dataset(file):
+        return dataset.read_dataset(file)
+    return read_single_csv(file)
+
+
+def read_single_csv(file, nrows=None):
+    """Reads one CSV, plain or compressed, with encoding detection and error handling."""
     encoding, error = detect_encoding(file)
     if error:
         return None, error
@@ -108,7 +95,57 @@ def read_csv_with_encoding(file):
         if not isinstance(file, str):
             file.seek(0)  # Reset stream before reading again
 
-        df = pd.read_csv(file, encoding=encoding)
+        compression = detect_compression(file)
+        with trace("parse", compression=compression) as record:
+            if compression:
+                # Decompressed on the fly; the full text is never held in memory
+                with open_decompressed(file, compression) as stream:
+                    df = pd.read_csv(stream, encoding=encoding, nrows=nrows)
+            elif isinstance(file, str) and nrows is None:
+                # Local path: parse straight from the memory-mapped file
+                df = read_mapped_csv(file, encoding)
+                record['engine'] = 'arrow' if pa is not None else 'mmap'
+            else:
+                df = pd.read_csv(file, encoding=encoding, nrows=nrows)
+            record['rows'] = len(df)
         return df, None
     except Exception as e:
-        return None, f"Error reading CSV: {e}"
\ No newline at end of file
+        return None, f"Error reading CSV: {e}"
+
+
+def read_mapped_prefix(path, size=SNIFF_BYTES):
+    """First bytes of a file, taken from a memory map instead of a buffered read."""
+    with open(path, "rb") as f:
+        try:
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                return mapped[:size]
+        except ValueError:  # Empty files cannot be mapped
+            return b""
+
+
+def read_mapped_csv(path, encoding="utf-8"):
+    """Parse a local CSV from a memory map without first reading it into Python bytes.
+
+    With pyarrow installed the multithreaded Arrow CSV reader runs over the map;
+    otherwise, or if Arrow rejects the file, pandas parses it with memory_map=True.
+    Temporal columns are kept as text so both paths return the same dtypes.
+    Arrow parses floats exactly, so values can differ from pandas' default
+    parser in the last bit.
+    """
+    if pa is not None:
+        try:
+            with pa.memory_map(path, "r") as source:
+                table = pa_csv.read_csv(
+                    source,
+                    read_options=pa_csv.ReadOptions(use_threads=True, encoding=encoding),
+                    convert_options=pa_csv.ConvertOptions(strings_can_be_null=True),
+                )
+            if any(pa.types.is_binary(field.type) for field in table.schema):
+                raise pa.ArrowInvalid("Bytes do not match the detected encoding")
+            temporal = [i for i, field in enumerate(table.schema) if pa.types.is_temporal(field.type)]
+            for i in temporal:
+                table = table.set_column(i, table.field(i).name, table.column(i).cast(pa.string()))
+            return table.to_pandas(split_blocks=True, self_destruct=True)
+        except (pa.ArrowInvalid, pa.ArrowNotImplementedError, LookupError, OSError):
+            pass  # pandas reports the problem, or copes with what Arrow cannot
+    return pd.read_csv(path, encoding=encoding, memory_map=True)
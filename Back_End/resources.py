@@ -0,0 +1,143 @@
+"""Process-wide CPU and memory budgets shared by every backend entry point.
+
+Jobs ask for workers and memory before they start. They are admitted in
+arrival order while both budgets allow; otherwise they wait in a queue and
+can report their position to the page. A job whose memory estimate exceeds
+the whole budget is still admitted (alone), flagged so callers can switch
+to a cheaper mode such as sampling.
+"""
+import itertools
+import os
+import threading
+from collections import deque
+from contextlib import contextmanager
+from Back_End.compression import COMPRESSED_SUFFIXES
+from Back_End.instrumentation import trace
+
+
+def _total_memory_mb():
+    try:
+        return os.sysconf('SC_PAGE_SIZE') * os.sysconf('SC_PHYS_PAGES') / (1024 * 1024)
+    except (ValueError, OSError, AttributeError):  # Not available on Windows
+        return 8192
+
+
+CPU_BUDGET = int(os.environ.get("MYCSV_CPU_BUDGET", os.cpu_count() or 1))
+MEMORY_BUDGET_MB = float(os.environ.get("MYCSV_MEMORY_BUDGET_MB", _total_memory_mb() / 2))
+MEMORY_PER_INPUT_BYTE = 5  # Parsed DataFrames take several times the CSV size
+COMPRESSED_RATIO = 5  # Typical text compression ratio of gzip, bz2 and zstd
+QUEUE_POLL_SECONDS = 1.0
+
+
+def input_size_bytes(file):
+    """Size of a path, upload or list of them, without reading the content."""
+    if isinstance(file, (list, tuple)):
+        return sum(input_size_bytes(f) for f in file)
+    if isinstance(file, str):
+        try:
+            return os.path.getsize(file)
+        except OSError:
+            return 0
+    size = getattr(file, 'size', None)  # Streamlit uploads know their size
+    if size is None:
+        try:
+            position = file.tell()
+            size = file.seek(0, os.SEEK_END)
+            file.seek(position)
+        except (AttributeError, OSError, ValueError):
+            size = 0
+    return size
+
+
+def estimate_memory_mb(file):
+    """Rough peak memory of loading ``file`` as a DataFrame."""
+    name = file if isinstance(file, str) else getattr(file, 'name', '') or ''
+    ratio = COMPRESSED_RATIO if str(name).lower().endswith(COMPRESSED_SUFFIXES) else 1
+    return input_size_bytes(file) * ratio * MEMORY_PER_INPUT_BYTE / (1024 * 1024)
+
+
+class Grant:
+    """Resources given to one job."""
+
+    def __init__(self, name, cpus, memory_mb, over_budget, waited_s):
+        self.name = name
+        self.cpus = cpus
+        self.memory_mb = memory_mb
+        self.over_budget = over_budget
+        self.waited_s = waited_s
+
+
+class ResourceGovernor:
+    """Admit jobs first-in first-out within a CPU-worker and a memory budget."""
+
+    def __init__(self, cpu_budget=CPU_BUDGET, memory_budget_mb=MEMORY_BUDGET_MB):
+        self.cpu_budget = max(1, cpu_budget)
+        self.memory_budget_mb = memory_budget_mb
+        self._cpus_free = self.cpu_budget
+        self._memory_free = memory_budget_mb
+        self._queue = deque()
+        self._tickets = itertools.count()
+        self._condition = threading.Condition()
+
+    def fits(self, memory_mb):
+        """Whether a job of this size fits the memory budget at all."""
+        return memory_mb <= self.memory_budget_mb
+
+    def status(self):
+        with self._condition:
+            return {
+                'cpus_free': self._cpus_free,
+                'cpu_budget': self.cpu_budget,
+                'memory_free_mb': self._memory_free,
+                'memory_budget_mb': self.memory_budget_mb,
+                'queued': len(self._queue),
+            }
+
+    @contextmanager
+    def job(self, name, cpus=1, memory_mb=0, min_cpus=1, on_queue=None):
+        """Hold up to ``cpus`` workers (at least ``min_cpus``) and ``memory_mb`` for the block.
+
+        ``on_queue(position)`` is called from the waiting thread whenever the
+        job's place in the queue changes (1 = next to run).
+        """
+        cpus = min(max(cpus, 1), self.cpu_budget)
+        min_cpus = min(max(min_cpus, 1), cpus)
+        over_budget = memory_mb > self.memory_budget_mb
+        charge = min(memory_mb, self.memory_budget_mb)
+
+        with trace("admission", job=name, cpus=cpus, memory_mb=round(memory_mb, 1)) as record:
+            with self._condition:
+                ticket = next(self._tickets)
+                self._queue.append(ticket)
+                position = None
+                try:
+                    while not (self._queue[0] == ticket and self._cpus_free >= min_cpus and self._memory_free >= charge):
+                        current = self._queue.index(ticket) + 1
+                        if on_queue is not None and current != position:
+                            on_queue(current)
+                        position = current
+                        self._condition.wait(QUEUE_POLL_SECONDS)
+                finally:
+                    self._queue.remove(ticket)
+                    self._condition.notify_all()
+                granted = min(cpus, self._cpus_free)
+                self._cpus_free -= granted
+                self._memory_free -= charge
+            record.update(granted_cpus=granted, over_budget=over_budget)
+        grant = Grant(name, granted, charge, over_budget, record['wall_s'])
+
+        try:
+            yield grant
+        finally:
+            with self._condition:
+                self._cpus_free += granted
+                self._memory_free += charge
+                self._condition.notify_all()
+
+
+governor = ResourceGovernor()
+
+
+def job(name, cpus=1, memory_mb=0, min_cpus=1, on_queue=None):
+    """Admission through the process-wide governor; see ``ResourceGovernor.job``."""
+    return governor.job(name, cpus, memory_mb, min_cpus, on_queue)
@@ -0,0 +1,155 @@
+import io
+from contextlib import ExitStack, nullcontext
+import numpy as np
+import pandas as pd
+from Back_End import process
+from Back_End import dataset
+from Back_End.compression import detect_compression, open_decompressed
+from Back_End.instrumentation import trace
+
+pd.options.mode.copy_on_write = True
+
+QUICK_REPORT_ROWS = 200000  # Sample size of a quick report
+CHUNK_ROWS = 200000
+MAX_STRATA = 100  # Above this many strata the sample is simply uniform
+STRATIFY_MAX_COLUMNS = 2
+STRATUM_MIN_ROWS = 50  # Every stratum keeps at least this many rows (or all of them)
+
+
+def iter_chunks(file, chunksize=CHUNK_ROWS, dtype=str, header='infer'):
+    """Yield the rows of a CSV, dataset or archive in chunks, one partition after another.
+
+    Chunks are text by default; pass ``dtype=None`` to let pandas infer dtypes per chunk.
+    A partition that turns out not to be in its detected encoding is read on as
+    ISO-8859-1 from the first row not yet yielded, as the full readers retry it.
+    """
+    with ExitStack() as archives:
+        for name, opener in dataset.list_partitions(file, archives):
+            yielded = 0
+            encoding = None
+            while True:
+                with opener() as source:
+                    if encoding is None:
+                        encoding, error = process.detect_encoding(source)
+                        if error:
+                            raise ValueError(f"{name}: {error}")
+                    if not isinstance(source, str):
+                        source.seek(0)
+
+                    # Rows already yielded are skipped; the header line stays
+                    first_row = 0 if header is None else 1
+                    skiprows = range(first_row, first_row + yielded)
+                    compression = detect_compression(source)
+                    with (open_decompressed(source, compression) if compression else nullcontext(source)) as stream:
+                        try:
+                            for chunk in pd.read_csv(stream, encoding=encoding, dtype=dtype, chunksize=chunksize,
+                                                     header=header, skiprows=skiprows):
+                                yielded += len(chunk)
+                                yield chunk
+                            break
+                        except UnicodeDecodeError:
+                            if encoding == "ISO-8859-1":
+                                raise
+                encoding = "ISO-8859-1"
+
+
+def stratify_columns(chunk, max_columns=STRATIFY_MAX_COLUMNS, max_strata=MAX_STRATA):
+    """Low-cardinality columns of the first chunk whose combinations stay under max_strata."""
+    counts = chunk.nunique()
+    candidates = counts[(counts >= 2) & (counts <= max_strata) & (counts < 0.5 * len(chunk))].sort_values()
+    columns, strata = [], 1
+    for col, n in candidates.items():
+        if len(columns) == max_columns or strata * n > max_strata:
+            break
+        columns.append(col)
+        strata *= n
+    return columns
+
+
+def stratum_ids(chunk, columns):
+    if not columns:
+        return np.zeros(len(chunk), dtype=np.uint64)
+    return pd.util.hash_pandas_object(chunk.reindex(columns=columns), index=False).to_numpy()
+
+
+def read_sample(file, sample_size=QUICK_REPORT_ROWS, chunksize=CHUNK_ROWS, random_state=0, header='infer'):
+    """Stratified random sample of a CSV read in one streaming pass.
+
+    Each row gets a random key and the sample keeps the ``sample_size`` smallest
+    keys (bottom-k reservoir sampling), so every row is equally likely to be
+    kept wherever it sits in the file. Rows are stratified by up to two
+    low-cardinality columns: every stratum keeps at least STRATUM_MIN_ROWS rows,
+    so rare categories still show up. Row and null counts are exact and stored in
+    ``df.attrs['sample']``; sampled rows keep their file order.
+    """
+    rng = np.random.default_rng(random_state)
+    sample = keys = strata = positions = None
+    strata_columns = None
+    rows = 0
+    nulls = pd.Series(dtype='int64')
+    stratum_rows = {}
+
+    try:
+        with trace("sample_read") as record:
+            # Everything is read as text; dtypes are inferred once on the final sample
+            for chunk in iter_chunks(file, chunksize, header=header):
+                if strata_columns is None:
+                    strata_columns = stratify_columns(chunk)
+
+                chunk_keys = rng.random(len(chunk))
+                chunk_strata = stratum_ids(chunk, strata_columns)
+                chunk_positions = np.arange(rows, rows + len(chunk))
+                rows += len(chunk)
+                nulls = nulls.add(chunk.isnull().sum(), fill_value=0)
+                for stratum, n in zip(*np.unique(chunk_strata, return_counts=True)):
+                    stratum_rows[stratum] = stratum_rows.get(stratum, 0) + int(n)
+                if len(stratum_rows) > MAX_STRATA:  # The columns were not as categorical as they looked
+                    strata_columns = []
+                    chunk_strata = stratum_ids(chunk, strata_columns)
+                    strata = np.zeros(len(strata), dtype=np.uint64) if strata is not None else None
+                    stratum_rows = {0: rows}
+
+                # Only rows that could still make the sample are concatenated with it
+                if sample is not None and len(keys) >= sample_size:
+                    threshold = np.partition(keys, sample_size - 1)[sample_size - 1]
+                    within_stratum = pd.Series(chunk_keys).groupby(chunk_strata).rank(method='first').to_numpy()
+                    candidate = (chunk_keys < threshold) | (within_stratum <= STRATUM_MIN_ROWS)
+                    chunk = chunk[candidate]
+                    chunk_keys, chunk_strata = chunk_keys[candidate], chunk_strata[candidate]
+                    chunk_positions = chunk_positions[candidate]
+
+                if sample is None:
+                    sample, keys, strata, positions = chunk, chunk_keys, chunk_strata, chunk_positions
+                else:
+                    sample = pd.concat([sample, chunk])
+                    keys = np.concatenate([keys, chunk_keys])
+                    strata = np.concatenate([strata, chunk_strata])
+                    positions = np.concatenate([positions, chunk_positions])
+
+                if len(keys) > sample_size:
+                    keep = keys <= np.partition(keys, sample_size - 1)[sample_size - 1]
+                    keep |= pd.Series(keys).groupby(strata).rank(method='first').to_numpy() <= STRATUM_MIN_ROWS
+                    sample, keys, strata, positions = sample[keep], keys[keep], strata[keep], positions[keep]
+
+            if sample is None:
+                return None, "No data found in the upload."
+
+            # Re-parse the text sample so dtypes are inferred as a full read would infer them
+            sample = sample.iloc[np.argsort(positions, kind='stable')]
+            buffer = io.StringIO()
+            sample.to_csv(buffer, index=False)
+            buffer.seek(0)
+            df = pd.read_csv(buffer)
+            df.columns = sample.columns
+            record.update(rows=rows, sample_rows=len(df))
+    except Exception as e:
+        return None, f"Error sampling CSV: {e}"
+
+    df.attrs['sample'] = {
+        'rows': rows,
+        'sample_rows': len(df),
+        'nulls': {col: int(n) for col, n in nulls.items()},
+        'strata_columns': strata_columns or [],
+        'strata': len(stratum_rows),
+    }
+    return df, None
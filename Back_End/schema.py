@@ -0,0 +1,102 @@
+import numpy as np
+import pandas as pd
+from Back_End import process
+from Back_End import dataset
+from Back_End.encoding import ONE_HOT_MAX_CATEGORIES
+
+pd.options.mode.copy_on_write = True
+
+
+def build_schema(X):
+    """Columns, dtype kinds and small category vocabularies of the training features."""
+    dtypes, vocabularies = {}, {}
+    for col in X.columns:
+        series = X[col]
+        if pd.api.types.is_bool_dtype(series):
+            dtypes[col] = 'boolean'
+        elif pd.api.types.is_numeric_dtype(series):
+            dtypes[col] = 'numeric'
+        else:
+            dtypes[col] = 'categorical'
+            values = series.dropna().unique()
+            if len(values) <= ONE_HOT_MAX_CATEGORIES:
+                vocabularies[col] = sorted(str(value) for value in values)
+    return {'columns': list(X.columns), 'dtypes': dtypes, 'vocabularies': vocabularies}
+
+
+def missing_columns_error(columns, schema):
+    present = set(columns)
+    missing = [col for col in schema['columns'] if col not in present]
+    if missing:
+        return f"Missing columns required by the model: {', '.join(map(str, missing))}"
+    return None
+
+
+def check_header(file, schema):
+    """Validate the header against the schema before the full parse; returns an error or None."""
+    if dataset.is_dataset(file):
+        return None  # Partitions are checked once they are read
+    header, error = process.read_single_csv(file, nrows=0)
+    if error:
+        return error
+    if not isinstance(file, str):
+        file.seek(0)
+    return missing_columns_error(header.columns, schema)
+
+
+BOOLEAN_VALUES = {'true': True, 'false': False, '1': True, '0': False, 'yes': True, 'no': False}
+
+
+def as_text(series):
+    """Values as the strings a CSV read gives a text column; whole floats lose their '.0'."""
+    if pd.api.types.is_float_dtype(series) and (series.dropna() % 1 == 0).all():
+        series = series.astype('Int64')
+    return series.astype(object).map(str, na_action='ignore').where(series.notna(), np.nan)
+
+
+def project(df, schema):
+    """Model columns of ``df`` in training order, plus a per-row reason it cannot be scored.
+
+    Columns are converted to their training representation: numbers for
+    numeric columns, strings for categorical ones (a column of codes may parse
+    as numbers in a new file) and True/False for boolean ones. Rows holding a
+    value that cannot be converted are marked as unscorable instead of failing
+    the whole file.
+    """
+    X = df[schema['columns']]
+    reasons = pd.Series(None, index=df.index, dtype=object)
+    for col, kind in schema['dtypes'].items():
+        if kind == 'numeric':
+            if pd.api.types.is_numeric_dtype(X[col]):
+                continue
+            converted = pd.to_numeric(X[col], errors='coerce')
+            problem = f"invalid number in {col}"
+        elif kind == 'boolean':
+            if pd.api.types.is_bool_dtype(X[col]):
+                continue
+            converted = as_text(X[col]).str.strip().str.lower().map(BOOLEAN_VALUES).astype(object)
+            problem = f"invalid boolean in {col}"
+        else:
+            if pd.api.types.is_object_dtype(X[col]):
+                continue  # Text as read from a CSV, like the training file
+            converted = as_text(X[col])
+            problem = None
+        if problem:
+            invalid = converted.isna() & X[col].notna()
+            reasons = reasons.mask(invalid & reasons.isna(), problem)
+        X[col] = converted
+    return X, reasons
+
+
+def row_status(X, reasons, schema):
+    """Status of every row after cleaning: skipped (with why), or scored with any warnings."""
+    missing = X.isna().to_numpy()
+    if missing.any():
+        first_missing = np.asarray(X.columns)[missing.argmax(axis=1)]
+        reasons = reasons.mask(missing.any(axis=1) & reasons.isna().to_numpy(), "missing value in " + pd.Series(first_missing, index=X.index).astype(str))
+
+    status = ("skipped: " + reasons).where(reasons.notna(), "scored")
+    for col, vocabulary in schema['vocabularies'].items():
+        unseen = X[col].notna() & ~X[col].astype(str).isin(vocabulary)
+        status = status.mask(unseen & reasons.isna(), status + f" (unseen category in {col})")
+    return status, reasons.isna()
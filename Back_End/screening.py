@@ -0,0 +1,105 @@
+import os
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.feature_selection import f_classif, f_regression, mutual_info_classif, mutual_info_regression
+from sklearn.utils.sparsefuncs import mean_variance_axis
+from Back_End.correlation import compute_correlation, collinear_columns
+from Back_End.instrumentation import trace
+
+MAX_FEATURES = int(os.environ.get("MYCSV_MAX_FEATURES", 100))  # Feature budget of the model search
+SCREEN_SAMPLE_ROWS = 50000  # Rows used to score features
+VARIANCE_TOLERANCE = 1e-12
+COLLINEAR_THRESHOLD = 0.99
+DENSE_COLUMN_DENSITY = 0.5  # Sparse matrices are checked for collinearity on columns this full
+
+
+class FeatureScreen(BaseEstimator, TransformerMixin):
+    """Keep the informative columns of the preprocessed matrix.
+
+    Fitting drops zero-variance columns and near-copies of another column, then
+    ranks the rest by a univariate score (``'f'`` for the F-test, ``'mi'`` for
+    mutual information) on a row sample and keeps the best ``max_features``.
+    ``report_`` records what was dropped and why.
+    """
+
+    def __init__(self, task_type='regression', max_features=MAX_FEATURES, score='f',
+                 sample_rows=SCREEN_SAMPLE_ROWS, feature_names=None, random_state=0):
+        self.task_type = task_type
+        self.max_features = max_features
+        self.score = score
+        self.sample_rows = sample_rows
+        self.feature_names = feature_names
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        n_rows, n_features = X.shape
+        names = np.asarray(self.feature_names if self.feature_names is not None else [f"x{i}" for i in range(n_features)], dtype=object)
+        y = np.asarray(y)
+
+        with trace("feature_screen", rows=n_rows, features=n_features) as record:
+            # Zero variance, computed on all rows (sparse-aware)
+            if sparse.issparse(X):
+                _, variance = mean_variance_axis(sparse.csr_matrix(X, dtype=np.float64), axis=0)
+            else:
+                variance = np.nanvar(np.asarray(X, dtype=np.float64), axis=0)
+            constant = variance <= VARIANCE_TOLERANCE
+            keep = ~constant
+
+            # Near-copies among dense columns (the scaled numbers); sparse one-hot blocks are left alone
+            collinear = np.zeros(n_features, dtype=bool)
+            kept = np.flatnonzero(keep)
+            if sparse.issparse(X):
+                X_csc = sparse.csc_matrix(X)
+                density = np.diff(X_csc.indptr) / max(n_rows, 1)
+                kept = kept[density[kept] > DENSE_COLUMN_DENSITY]
+                dense = X_csc[:, kept].toarray()
+            else:
+                dense = np.asarray(X)[:, kept]
+            if len(kept) > 1:
+                corr = compute_correlation(pd.DataFrame(dense, columns=kept))
+                collinear[collinear_columns(corr, COLLINEAR_THRESHOLD)] = True
+                keep &= ~collinear
+
+            # Univariate ranking on a sample, only when over budget
+            scores = np.full(n_features, np.nan)
+            low_score = np.zeros(n_features, dtype=bool)
+            if self.max_features and keep.sum() > self.max_features:
+                rng = np.random.default_rng(self.random_state)
+                rows = rng.choice(n_rows, self.sample_rows, replace=False) if n_rows > self.sample_rows else np.arange(n_rows)
+                kept = np.flatnonzero(keep)
+                X_sample = X[rows][:, kept]
+                scores[kept] = self._score(X_sample, y[rows])
+                ranked = kept[np.argsort(-np.nan_to_num(scores[kept], nan=-np.inf), kind='stable')]
+                low_score[ranked[self.max_features:]] = True
+                keep &= ~low_score
+
+            record['kept'] = int(keep.sum())
+
+        self.n_features_in_ = n_features
+        self.support_ = keep
+        self.scores_ = scores
+        self.report_ = {
+            'features_in': int(n_features),
+            'kept': names[keep].tolist(),
+            'dropped_constant': names[constant].tolist(),
+            'dropped_collinear': names[collinear].tolist(),
+            'dropped_low_score': names[low_score].tolist(),
+            'score': self.score,
+            'max_features': self.max_features,
+        }
+        return self
+
+    def _score(self, X, y):
+        if self.score == 'mi':
+            mutual_info = mutual_info_classif if self.task_type == 'classification' else mutual_info_regression
+            return mutual_info(X, y, random_state=self.random_state)
+        f_test = f_classif if self.task_type == 'classification' else f_regression
+        return f_test(X, y)[0]
+
+    def transform(self, X):
+        return X[:, self.support_]
+
+    def get_support(self):
+        return self.support_
@@ -1,37 +1,108 @@
 import pandas as pd
 import io
-import process
+import os
+from concurrent.futures import ThreadPoolExecutor
+from Back_End import process
+from Back_End import resources
+from Back_End import schema as model_schema
+from Back_End.cleaning import CleaningPlan
+from Back_End.sampling import iter_chunks
+from Back_End.instrumentation import trace
 import joblib
 
 pd.options.mode.copy_on_write = True
 
-def process_file(file, model_path):
-    """Process CSV file and make predictions using saved pipeline."""
-    # Read and clean CSV
-    df, error = process.read_csv_with_encoding(file)
-    df = process.process_file(df)
-    if error:
-        return None, error
+SCORE_CHUNK_ROWS = 100000
+CHUNKED_SCORE_MEMORY_MB = 512  # Charged for chunked scoring, whatever the input size
+TOO_LARGE_ERROR = "The file is too large for the memory budget and this model predates chunked scoring; retrain it to score the file."
+
+
+def scoring_memory_mb(file):
+    """Memory to reserve for scoring ``file``, and whether it must be scored in chunks."""
+    memory_mb = resources.estimate_memory_mb(file)
+    if resources.governor.fits(memory_mb):
+        return memory_mb, False
+    return min(memory_mb, CHUNKED_SCORE_MEMORY_MB), True
+
+
+def process_file(file, model_path, on_queue=None):
+    """Process CSV file and make predictions using saved pipeline.
+
+    Inputs too large for the memory budget are scored chunk by chunk.
+    """
+    memory_mb, chunked = scoring_memory_mb(file)
+    with resources.job("score", memory_mb=memory_mb, on_queue=on_queue):
+        return score_file(file, model_path, chunked)
 
-    df_clean = process.process_file(df)
-    if df_clean is None:
-        return None, "Error processing data"
 
+def score_in_chunks(file, score_frame, chunksize=SCORE_CHUNK_ROWS):
+    """Score a CSV chunk by chunk with ``score_frame(df) -> (df_result, error)``, appending to one CSV buffer.
+
+    Chunks are read as text, as a column of codes is at training time; the
+    schema converts the model columns.
+    """
+    csv_output = io.StringIO()
+    with trace("chunked_score") as record:
+        try:
+            for chunk in iter_chunks(file, chunksize):
+                df_result, error = score_frame(chunk)
+                if error:
+                    return None, error
+                df_result.to_csv(csv_output, index=False, header=csv_output.tell() == 0)
+        except Exception as e:
+            return None, f"Error reading CSV: {e}"
+        record['bytes'] = csv_output.tell()
+    csv_output.seek(0)
+    return csv_output, None
+
+
+def score_file(file, model_path, chunked=False):
     # Load trained model, scaler, and task type
     model_package = joblib.load(model_path)
     pipeline = model_package['pipeline']
     y_scaler = model_package.get('y_scaler', None)
     task_type = model_package.get('task_type', 'regression')  # Default to regression
+    schema = model_package.get('schema')
+
+    # A header that lacks model columns fails before the file is parsed
+    if schema is not None:
+        error = model_schema.check_header(file, schema)
+        if error:
+            return None, error
+
+    if chunked:
+        # Rows are scored independently only with a schema; older packages clean across rows
+        if schema is None:
+            return None, TOO_LARGE_ERROR
+        return score_in_chunks(file, lambda chunk: score_frame(chunk, model_package))
+
+    # Read CSV
+    df, error = process.read_csv_with_encoding(file)
+    if error:
+        return None, error
+
+    plan = model_package.get('cleaning_plan')
+    if schema is not None:
+        return score_with_schema(df, model_package)
+
+    # Clean with the training-time plan; older packages fall back to re-fitting
+    if plan is not None:
+        df_clean = CleaningPlan.from_dict(plan).transform(df)
+    else:
+        df_clean = process.process_file(df)
+    if df_clean is None:
+        return None, "Error processing data"
 
     # Make predictions
-    predictions = pipeline.predict(df_clean)
+    with trace("predict", rows=len(df_clean)):
+        predictions = pipeline.predict(df_clean)
 
     # Reverse standardization if regression
     if task_type == 'regression' and y_scaler is not None:
         predictions = y_scaler.inverse_transform(predictions.reshape(-1, 1)).ravel()
 
-    # Attach predictions to original DataFrame
-    df_result = df.copy()
+    # Attach predictions to the original rows that survived cleaning
+    df_result = df.loc[df_clean.index]
     df_result['Predictions'] = predictions
 
     # Save to CSV in memory
@@ -39,4 +110,166 @@ def process_file(file, model_path):
     df_result.to_csv(csv_output, index=False)
     csv_output.seek(0)
 
-    return csv_output, None
\ No newline at end of file
+    return csv_output, None
+
+
+def prepare_features(df, model_package):
+    """Cleaned model inputs of the scorable rows, and the status of every row.
+
+    With a schema only the model columns are cleaned, the training plan being
+    replayed without dropping rows; older packages report the rows their
+    cleaning removes as skipped.
+    """
+    schema = model_package.get('schema')
+    plan = model_package.get('cleaning_plan')
+    if schema is not None:
+        X, reasons = model_schema.project(df, schema)
+        if plan is not None:
+            X = CleaningPlan.from_dict(plan).transform(X, drop_rows=False)
+        status, scorable = model_schema.row_status(X, reasons, schema)
+        return X[scorable], status
+
+    X = CleaningPlan.from_dict(plan).transform(df) if plan is not None else process.process_file(df)
+    status = pd.Series("skipped: removed by cleaning", index=df.index, dtype=object)
+    status[X.index] = "scored"
+    return X, status
+
+
+def predict_with(model_package, X, final_step_only=False):
+    """Predictions of one package in target units; X is already transformed if final_step_only."""
+    pipeline = model_package['pipeline']
+    model = pipeline[-1] if final_step_only else pipeline
+    predictions = model.predict(X)
+    if model_package.get('task_type', 'regression') == 'regression' and model_package.get('y_scaler') is not None:
+        predictions = model_package['y_scaler'].inverse_transform(predictions.reshape(-1, 1)).ravel()
+    return predictions
+
+
+def attach_predictions(df_result, column, index, predictions):
+    df_result[column] = pd.Series(pd.NA, index=df_result.index, dtype=object)
+    if len(index):
+        df_result.loc[index, column] = predictions
+        df_result[column] = df_result[column].infer_objects()
+    return df_result
+
+
+def score_frame(df, model_package):
+    """Every row of ``df`` with its prediction, or the reason it was skipped in a Status column."""
+    error = model_schema.missing_columns_error(df.columns, model_package['schema'])
+    if error:
+        return None, error
+
+    X, status = prepare_features(df, model_package)
+    predictions = []
+    if len(X):
+        with trace("predict", rows=len(X)):
+            predictions = predict_with(model_package, X)
+
+    df_result = attach_predictions(df, 'Predictions', X.index, predictions)
+    df_result['Status'] = status
+    return df_result, None
+
+
+def score_with_schema(df, model_package):
+    """Score every row that can be scored and report the rest in a Status column."""
+    df_result, error = score_frame(df, model_package)
+    if error:
+        return None, error
+
+    csv_output = io.StringIO()
+    df_result.to_csv(csv_output, index=False)
+    csv_output.seek(0)
+
+    return csv_output, None
+
+
+def model_names(model_paths):
+    """Output column label of each model: its file name without .pkl, made unique."""
+    names = []
+    for path in model_paths:
+        name = os.path.basename(path if isinstance(path, str) else getattr(path, 'name', 'model'))
+        name = name[:-4] if name.lower().endswith('.pkl') else name
+        names.append(name if name not in names else f"{name}_{len(names) + 1}")
+    return names
+
+
+def score_models(file, model_paths, max_workers=None, on_queue=None):
+    """Score one input with several model packages in a single pass.
+
+    The file is read once. Models whose cleaning and preprocessing steps are
+    identical share one cleaned, transformed matrix, on which their final
+    estimators predict in parallel. The output has one ``Predictions (name)``
+    column per model, and a Status column per group of models that share
+    preprocessing.
+    """
+    if len(model_paths) == 1:
+        return process_file(file, model_paths[0], on_queue)
+
+    memory_mb, chunked = scoring_memory_mb(file)
+    with resources.job("score", cpus=len(model_paths), memory_mb=memory_mb, on_queue=on_queue) as grant:
+        return score_file_with_models(file, model_paths, min(max_workers or grant.cpus, grant.cpus), chunked)
+
+
+def score_file_with_models(file, model_paths, max_workers, chunked=False):
+    packages = [joblib.load(path) for path in model_paths]
+    names = model_names(model_paths)
+
+    # Every header check runs before the one full parse
+    for package in packages:
+        if package.get('schema') is not None:
+            error = model_schema.check_header(file, package['schema'])
+            if error:
+                return None, error
+
+    groups = {}
+    for name, package in zip(names, packages):
+        key = joblib.hash((package.get('cleaning_plan'), package.get('schema'), package['pipeline'][:-1]))
+        groups.setdefault(key, []).append((name, package))
+
+    if chunked:
+        if any(package.get('schema') is None for package in packages):
+            return None, TOO_LARGE_ERROR
+        return score_in_chunks(file, lambda chunk: score_frame_with_models(chunk, groups, max_workers))
+
+    df, error = process.read_csv_with_encoding(file)
+    if error:
+        return None, error
+
+    df_result, error = score_frame_with_models(df, groups, max_workers)
+    if error:
+        return None, error
+
+    csv_output = io.StringIO()
+    df_result.to_csv(csv_output, index=False)
+    csv_output.seek(0)
+
+    return csv_output, None
+
+
+def score_frame_with_models(df, groups, max_workers):
+    """``df`` with one prediction column per model; ``groups`` share cleaning and preprocessing."""
+    df_result = df
+    for members in groups.values():
+        first = members[0][1]
+        if first.get('schema') is not None:
+            error = model_schema.missing_columns_error(df.columns, first['schema'])
+            if error:
+                return None, error
+
+        with trace("shared_preprocess", models=len(members)) as record:
+            X, status = prepare_features(df, first)
+            Xt = first['pipeline'][:-1].transform(X) if len(X) else None
+            record['rows'] = len(X)
+
+        with trace("predict", rows=len(X), models=len(members)):
+            if Xt is None:
+                predictions = [[] for _ in members]
+            else:
+                with ThreadPoolExecutor(max_workers=min(max_workers, len(members))) as pool:
+                    predictions = list(pool.map(lambda member: predict_with(member[1], Xt, final_step_only=True), members))
+
+        for (name, _), model_predictions in zip(members, predictions):
+            df_result = attach_predictions(df_result, f"Predictions ({name})", X.index, model_predictions)
+        label = "Status" if len(groups) == 1 else f"Status ({', '.join(name for name, _ in members)})"
+        df_result[label] = status
+    return df_result, None
@@ -0,0 +1,79 @@
+import numpy as np
+import pandas as pd
+
+MAX_BUCKETS = 60  # Upper bound on bars drawn per time-series chart
+
+HOUR_NS = 3600 * 10**9
+DAY_NS = 24 * HOUR_NS
+
+# Resolution name, approximate width in ns, calendar frequency (None for fixed width)
+RESOLUTIONS = [
+    ('hour', HOUR_NS, None),
+    ('day', DAY_NS, None),
+    ('week', 7 * DAY_NS, None),
+    ('month', 31 * DAY_NS, 'MS'),
+    ('quarter', 92 * DAY_NS, 'QS'),
+    ('year', 366 * DAY_NS, 'YS'),
+]
+PERIOD_CODES = {'MS': 'M', 'QS': 'Q', 'YS': 'Y'}
+
+
+def to_nanoseconds(series):
+    """Non-null timestamps of a datetime column as int64 nanoseconds since the epoch."""
+    values = series.dropna()
+    if getattr(values.dtype, 'tz', None) is not None:
+        values = values.dt.tz_localize(None)
+    return values.to_numpy(dtype='datetime64[ns]').view('i8')
+
+
+def choose_resolution(span_ns, max_buckets=MAX_BUCKETS):
+    """Finest resolution that covers the span in at most max_buckets buckets."""
+    for name, width, _ in RESOLUTIONS:
+        if span_ns < width * max_buckets:
+            return name
+    return RESOLUTIONS[-1][0]
+
+
+def bucket_counts(series, resolution=None, max_buckets=MAX_BUCKETS):
+    """Record counts per time bucket, computed on int64 timestamps with NumPy.
+
+    Fixed-width buckets (hour/day/week) use integer division and bincount;
+    calendar buckets (month/quarter/year) use searchsorted against the bucket
+    edges. Returns a Series indexed by bucket start, including empty buckets.
+    """
+    values = to_nanoseconds(series)
+    if len(values) == 0:
+        return pd.Series(dtype='int64', index=pd.DatetimeIndex([]))
+
+    lo, hi = values.min(), values.max()
+    resolution = resolution or choose_resolution(hi - lo, max_buckets)
+    _, width, freq = next(r for r in RESOLUTIONS if r[0] == resolution)
+    first = pd.Timestamp(lo)
+
+    if freq is None:
+        start = first.floor('D' if resolution != 'hour' else 'h')
+        if resolution == 'week':
+            start -= pd.Timedelta(days=start.weekday())  # Weeks start on Monday
+        counts = np.bincount((values - start.value) // width)
+        index = pd.date_range(start, periods=len(counts), freq=pd.Timedelta(width))
+    else:
+        start = first.to_period(PERIOD_CODES[freq]).start_time
+        index = pd.date_range(start, pd.Timestamp(hi), freq=freq)
+        edges = index.asi8
+        counts = np.bincount(np.searchsorted(edges, values, side='right') - 1, minlength=len(edges))
+
+    return pd.Series(counts, index=index, name=resolution)
+
+
+def summarize_dates(series):
+    """Range and natural chart resolution of a datetime column."""
+    values = to_nanoseconds(series)
+    if len(values) == 0:
+        return {}
+    lo, hi = values.min(), values.max()
+    return {
+        'min': pd.Timestamp(lo).isoformat(),
+        'max': pd.Timestamp(hi).isoformat(),
+        'resolution': choose_resolution(hi - lo),
+        'count': int(len(values)),
+    }
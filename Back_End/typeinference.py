@@ -0,0 +1,94 @@
+import numpy as np
+import pandas as pd
+from Back_End.instrumentation import trace
+
+pd.options.mode.copy_on_write = True
+
+TYPE_SAMPLE_ROWS = 10000  # Values inspected per column before any full pass
+CATEGORICAL_RATIO = 0.5  # Distinct values per row below which a column is categorical
+AMBIGUOUS_BAND = (0.4, 0.6)  # Estimated ratios in here are confirmed on the full column
+SAMPLE_GROWTH = 4  # Sample enlargement while the estimate stays in the band
+CONFIRM_BLOCK_ROWS = 100000
+
+
+def sample_values(series, sample_rows=TYPE_SAMPLE_ROWS, random_state=0):
+    """Random non-null values of a column, at most sample_rows of them."""
+    if len(series) > sample_rows:
+        positions = np.random.default_rng(random_state).choice(len(series), sample_rows, replace=False)
+        series = series.iloc[np.sort(positions)]
+    return series.dropna()
+
+
+def estimate_distinct(values, fraction):
+    """Estimate how many distinct values the column holds from a sample of it.
+
+    Chao1 corrected for sampling a ``fraction`` of the rows without
+    replacement, so an all-distinct sample scales up to an all-distinct column.
+    """
+    if fraction >= 1:
+        return values.nunique()
+    frequencies = values.value_counts().value_counts()
+    observed = int(frequencies.sum())
+    singletons = int(frequencies.get(1, 0))
+    doubletons = int(frequencies.get(2, 0))
+    if not singletons:
+        return observed
+    n = len(values)
+    unseen = singletons ** 2 / (2 * doubletons * n / max(1, n - 1) + singletons * fraction / (1 - fraction))
+    return observed + unseen
+
+
+def distinct_ratio_exceeds(series, ratio=CATEGORICAL_RATIO, block_rows=CONFIRM_BLOCK_ROWS):
+    """Whether distinct values / rows reaches ``ratio``; stops as soon as it is certain."""
+    limit = ratio * len(series)
+    seen = set()
+    for start in range(0, len(series), block_rows):
+        seen.update(series.iloc[start:start + block_rows].dropna().unique())
+        if len(seen) >= limit:
+            return True
+    return False
+
+
+def infer_object_column(series, sample_rows=TYPE_SAMPLE_ROWS):
+    """Classify a text column as 'datetime', 'categorical' or 'text' from a bounded sample.
+
+    Returns the kind and, for dates, the parsed column. A column is a date only
+    if every value parses, so one failure in the sample settles it; a fully
+    parsed sample is confirmed on the whole column. Categorical versus text
+    compares distinct values per row with 0.5, estimated from growing samples
+    and counted on the full column (stopping early) only when they stay close.
+    """
+    values = sample_values(series, sample_rows)
+
+    with trace("type_inference", rows=len(series), column=str(series.name)) as record:
+        try:
+            if len(values):
+                pd.to_datetime(values, errors='raise')  # Fails on the first value that is not a date
+                record['decided_by'] = 'full'
+                return 'datetime', pd.to_datetime(series, errors='raise')
+        except Exception:
+            pass
+
+        if len(series) <= sample_rows:
+            record['decided_by'] = 'exact'
+            ratio = series.nunique() / max(1, len(series))
+            return ('categorical' if ratio < CATEGORICAL_RATIO else 'text'), None
+
+        non_null = int(series.notna().sum())
+        rows = sample_rows
+        while True:
+            estimated_ratio = min(estimate_distinct(values, rows / len(series)), non_null) / len(series)
+            record.update(decided_by='sample', sample_rows=rows)
+            if estimated_ratio < AMBIGUOUS_BAND[0]:
+                return 'categorical', None
+            if estimated_ratio > AMBIGUOUS_BAND[1]:
+                return 'text', None
+            # Close to the threshold: a larger sample sharpens the estimate,
+            # until it would cost about as much as counting the column
+            if rows * SAMPLE_GROWTH > len(series) // 2:
+                break
+            rows *= SAMPLE_GROWTH
+            values = sample_values(series, rows)
+
+        record['decided_by'] = 'full'
+        return ('text' if distinct_ratio_exceeds(series) else 'categorical'), None
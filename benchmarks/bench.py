@@ -0,0 +1,243 @@
+"""Benchmarks for the Back_End entry points on synthetic CSVs.
+
+Usage (from the repository root):
+
+    python benchmarks/bench.py run --preset quick --output results.json
+    python benchmarks/bench.py run --rows 100000 --columns 50 --output results.json
+    python benchmarks/bench.py compare baseline.json results.json --threshold 0.1
+
+Every entry point runs in a fresh process with empty checkpoint and chart
+cache directories, so timings and peak RSS are not skewed by earlier runs.
+"""
+import argparse
+import json
+import multiprocessing
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+
+import numpy as np
+import pandas as pd
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+ENTRY_POINTS = ['process', 'csv_processor', 'csv_processor2', 'csv_processor3', 'testing']
+
+# Dataset shapes per preset: rows, columns, (numeric, string, date) mix, missing rate, encoding
+PRESETS = {
+    'quick': [
+        dict(rows=10_000, columns=10, mix=(0.6, 0.3, 0.1), missing_rate=0.05, encoding='utf-8'),
+    ],
+    'standard': [
+        dict(rows=10_000, columns=10, mix=(0.6, 0.3, 0.1), missing_rate=0.05, encoding='utf-8'),
+        dict(rows=100_000, columns=20, mix=(0.5, 0.4, 0.1), missing_rate=0.1, encoding='utf-8'),
+        dict(rows=100_000, columns=100, mix=(0.8, 0.15, 0.05), missing_rate=0.02, encoding='latin-1'),
+        dict(rows=1_000_000, columns=5, mix=(0.4, 0.4, 0.2), missing_rate=0.05, encoding='utf-8'),
+    ],
+    'full': [
+        dict(rows=10_000, columns=1000, mix=(0.9, 0.08, 0.02), missing_rate=0.05, encoding='utf-8'),
+        dict(rows=1_000_000, columns=50, mix=(0.6, 0.3, 0.1), missing_rate=0.1, encoding='utf-8'),
+        dict(rows=10_000_000, columns=5, mix=(0.6, 0.2, 0.2), missing_rate=0.05, encoding='utf-8'),
+    ],
+}
+
+# Training and scoring grow much faster than the other stages; they are skipped above this
+MAX_TRAINING_ROWS = 200_000
+
+
+def case_id(case):
+    numeric, string, date = case['mix']
+    return (f"r{case['rows']}_c{case['columns']}_n{numeric:g}s{string:g}d{date:g}"
+            f"_m{case['missing_rate']:g}_{case['encoding']}")
+
+
+def generate_csv(path, rows, columns, mix=(0.6, 0.3, 0.1), missing_rate=0.05, encoding='utf-8', seed=0):
+    """Write a synthetic CSV whose last column is a numeric target."""
+    rng = np.random.default_rng(seed)
+    n_numeric = max(1, round(columns * mix[0]))
+    n_date = round(columns * mix[2])
+    n_string = max(0, columns - n_numeric - n_date)
+
+    data = {}
+    for i in range(n_numeric):
+        data[f"num_{i}"] = rng.normal(loc=i, scale=1 + i % 5, size=rows).round(4)
+    for i in range(n_string):
+        # Mix of low- and high-cardinality text, with accented values for non-ASCII encodings
+        vocabulary = np.array([f"caté_{j}" if encoding != 'ascii' else f"cat_{j}" for j in range(5 * 10 ** (i % 3))])
+        data[f"str_{i}"] = vocabulary[rng.integers(0, len(vocabulary), size=rows)]
+    for i in range(n_date):
+        start = pd.Timestamp('2000-01-01').value
+        stamps = rng.integers(start, pd.Timestamp('2024-12-31').value, size=rows)
+        data[f"date_{i}"] = pd.to_datetime(stamps).strftime('%Y-%m-%d')
+
+    df = pd.DataFrame(data)
+    if missing_rate:
+        mask = rng.random(df.shape) < missing_rate
+        df = df.mask(mask)
+    numeric = df.filter(like='num_')
+    df['target'] = numeric.fillna(0).sum(axis=1) + rng.normal(size=rows)
+
+    df.to_csv(path, index=False, encoding=encoding)
+    return path
+
+
+def peak_rss_mb():
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_entry_point(entry_point, csv_path, work_dir):
+    """Run one entry point in this (fresh) process and report its cost."""
+    # Checkpoints and charts of one entry point are never reused by another
+    os.environ['MYCSV_WORK_DIR'] = os.path.join(work_dir, 'checkpoints', entry_point)
+    os.environ['MYCSV_CHART_CACHE_DIR'] = os.path.join(work_dir, 'charts', entry_point)
+    os.chdir(work_dir)
+    sys.path.insert(0, REPO_ROOT)
+
+    from Back_End import process, csv_processor, csv_processor2, csv_processor3, testing
+
+    start = time.perf_counter()
+    error = None
+    try:
+        if entry_point == 'process':
+            df, error = process.read_csv_with_encoding(csv_path)
+            if error is None:
+                process.process_file(df)
+        elif entry_point == 'csv_processor':
+            result = csv_processor.process_file(csv_path)
+            error = result if isinstance(result, str) else None
+        elif entry_point == 'csv_processor2':
+            result = csv_processor2.process_file(csv_path)
+            error = result[1] if isinstance(result, tuple) else None
+            if error is None:
+                os.remove(result)
+        elif entry_point == 'csv_processor3':
+            result = csv_processor3.process_file(csv_path)
+            error = result if isinstance(result, str) else None
+        elif entry_point == 'testing':
+            _, error = testing.process_file(csv_path, os.path.join(work_dir, 'best_model.pkl'))
+    except Exception as e:
+        error = f"{type(e).__name__}: {e}"
+    return {'wall_s': time.perf_counter() - start, 'peak_rss_mb': peak_rss_mb(), 'error': error}
+
+
+def run_isolated(entry_point, csv_path, work_dir):
+    ctx = multiprocessing.get_context('spawn')
+    with ctx.Pool(1) as pool:
+        return pool.apply(run_entry_point, (entry_point, csv_path, work_dir))
+
+
+def run_benchmarks(cases, entry_points, output):
+    results = []
+    with tempfile.TemporaryDirectory(prefix='mycsv_bench_') as tmp:
+        for case in cases:
+            cid = case_id(case)
+            csv_path = os.path.join(tmp, f"{cid}.csv")
+            print(f"[{cid}] generating data...", flush=True)
+            generate_csv(csv_path, **case)
+            size_mb = os.path.getsize(csv_path) / (1024 * 1024)
+
+            work_dir = os.path.join(tmp, cid)
+            os.makedirs(work_dir, exist_ok=True)
+            for entry_point in entry_points:
+                if entry_point in ('csv_processor3', 'testing') and case['rows'] > MAX_TRAINING_ROWS:
+                    continue
+                # Scoring needs the model trained on the same case
+                if entry_point == 'testing' and not os.path.exists(os.path.join(work_dir, 'best_model.pkl')):
+                    run_isolated('csv_processor3', csv_path, work_dir)
+
+                outcome = run_isolated(entry_point, csv_path, work_dir)
+                record = {
+                    'case': cid, 'entry_point': entry_point, **case, 'mix': list(case['mix']),
+                    'size_mb': round(size_mb, 3), **outcome,
+                    'rows_per_s': case['rows'] / outcome['wall_s'] if outcome['wall_s'] else None,
+                    'mb_per_s': size_mb / outcome['wall_s'] if outcome['wall_s'] else None,
+                }
+                results.append(record)
+                status = f"error: {outcome['error']}" if outcome['error'] else "ok"
+                print(f"[{cid}] {entry_point:15s} {outcome['wall_s']:9.2f}s "
+                      f"{outcome['peak_rss_mb']:9.1f} MB  {status}", flush=True)
+
+    report = {'meta': run_metadata(), 'results': results}
+    with open(output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"Results written to {output}")
+    return report
+
+
+def run_metadata():
+    try:
+        commit = subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=REPO_ROOT, capture_output=True, text=True).stdout.strip()
+    except OSError:
+        commit = None
+    return {
+        'timestamp': time.strftime('%Y-%m-%d %H:%M:%S'),
+        'commit': commit,
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cpu_count': os.cpu_count(),
+        'pandas': pd.__version__,
+        'numpy': np.__version__,
+    }
+
+
+def compare(baseline_path, candidate_path, threshold=0.1):
+    """Print runs that got slower or heavier by more than threshold; return their count."""
+    with open(baseline_path, encoding='utf-8') as f:
+        baseline = {(r['case'], r['entry_point']): r for r in json.load(f)['results']}
+    with open(candidate_path, encoding='utf-8') as f:
+        candidate = json.load(f)['results']
+
+    regressions = 0
+    for run in candidate:
+        base = baseline.get((run['case'], run['entry_point']))
+        if base is None or base.get('error') or run.get('error'):
+            continue
+        time_ratio = run['wall_s'] / base['wall_s'] if base['wall_s'] else 1
+        memory_ratio = run['peak_rss_mb'] / base['peak_rss_mb'] if base['peak_rss_mb'] else 1
+        flag = time_ratio > 1 + threshold or memory_ratio > 1 + threshold
+        regressions += flag
+        print(f"{'REGRESSION' if flag else 'ok':10s} {run['case']} {run['entry_point']:15s} "
+              f"time x{time_ratio:.2f} ({base['wall_s']:.2f}s -> {run['wall_s']:.2f}s)  "
+              f"memory x{memory_ratio:.2f} ({base['peak_rss_mb']:.0f} -> {run['peak_rss_mb']:.0f} MB)")
+    print(f"{regressions} regression(s) above {threshold:.0%}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the MYCSV backend on synthetic data.")
+    sub = parser.add_subparsers(dest='command', required=True)
+
+    run = sub.add_parser('run', help="Generate data and time the entry points")
+    run.add_argument('--preset', choices=sorted(PRESETS), default='quick')
+    run.add_argument('--rows', type=int, help="Single custom case instead of a preset")
+    run.add_argument('--columns', type=int, default=10)
+    run.add_argument('--mix', type=float, nargs=3, default=(0.6, 0.3, 0.1), metavar=('NUMERIC', 'STRING', 'DATE'))
+    run.add_argument('--missing-rate', type=float, default=0.05)
+    run.add_argument('--encoding', default='utf-8')
+    run.add_argument('--entry-points', nargs='+', choices=ENTRY_POINTS, default=ENTRY_POINTS)
+    run.add_argument('--output', default='bench_results.json')
+
+    cmp = sub.add_parser('compare', help="Flag regressions between two result files")
+    cmp.add_argument('baseline')
+    cmp.add_argument('candidate')
+    cmp.add_argument('--threshold', type=float, default=0.1, help="Allowed relative slowdown (0.1 = 10%%)")
+
+    args = parser.parse_args(argv)
+    if args.command == 'run':
+        if args.rows:
+            cases = [dict(rows=args.rows, columns=args.columns, mix=tuple(args.mix),
+                          missing_rate=args.missing_rate, encoding=args.encoding)]
+        else:
+            cases = PRESETS[args.preset]
+        run_benchmarks(cases, args.entry_points, args.output)
+        return 0
+    return 1 if compare(args.baseline, args.candidate, args.threshold) else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -2,7 +2,6 @@ import streamlit as st
 from Back_End import csv_processor
 from Back_End import process
 import io
-import pandas as pd
 
 # ---- PAGE CONFIG ----
 st.set_page_config(
@@ -62,19 +61,19 @@ st.markdown('<h1 class="title">🧼 CSV Data Cleaner</h1>', unsafe_allow_html=Tr
 st.markdown('<p style="text-align: center; color: #FFFFFF;">Upload your CSV file, and we’ll clean it for you!</p>', unsafe_allow_html=True)
 
 st.markdown('<h2 class="tab_title">CSV Cleaner</h2>', unsafe_allow_html=True)
-uploaded_file_cleaner = st.file_uploader("Choose a CSV file", type=["csv"], key="cleaner")
+uploaded_files_cleaner = st.file_uploader("Choose CSV files (partitions of one dataset) or a zip of CSVs", type=["csv", "zip", "gz", "bz2", "zst"], key="cleaner", accept_multiple_files=True)
 
 st.markdown("⚠️ **Note:** For best performance, please upload CSV files smaller than **25MB**.")
 
-if uploaded_file_cleaner:
-    if uploaded_file_cleaner.name.endswith('.csv'):
-        # Unpack the returned tuple: (DataFrame, encoding)
-        temp_df, _ = process.read_csv_with_encoding(uploaded_file_cleaner)
+if uploaded_files_cleaner:
+    # Several files are read in parallel and cleaned as one table
+    uploaded_file_cleaner = uploaded_files_cleaner[0] if len(uploaded_files_cleaner) == 1 else uploaded_files_cleaner
+    if all(f.name.endswith(('.csv', '.zip', '.gz', '.bz2', '.zst')) for f in uploaded_files_cleaner):
+        # Only the first rows are loaded here; the export streams the whole file
+        temp_df, error = csv_processor.read_head(uploaded_file_cleaner)
 
         if temp_df is None:
-            st.error("❌ Error: No data was loaded.")
-        elif isinstance(temp_df, str):
-            st.error(f"❌ Error: {temp_df}")
+            st.error(f"❌ Error: {error or 'No data was loaded.'}")
         else:
             with st.form("column_selection_form"):
                 st.write("### Select Columns to Include in Export and Apply Cleaning")
@@ -83,23 +82,40 @@ if uploaded_file_cleaner:
                     temp_df.columns.tolist(),
                     default=temp_df.columns.tolist()
                 )
+                outlier_choice = st.selectbox(
+                    "📏 Numeric outliers (outside 1.5× the interquartile range):",
+                    ["Keep", "Clip to bounds", "Remove rows"]
+                )
                 submitted = st.form_submit_button("✅ Clean and Export")
 
 
             if submitted:
-                with st.spinner("Processing... ⏳"):
-                    uploaded_file_cleaner.seek(0)
-                    processed_output = csv_processor.process_file(
-                        uploaded_file_cleaner,
-                        columns_to_include=selected_columns,
-                        columns_to_clean=selected_columns
-                    )
+                outliers = {"Clip to bounds": "clip", "Remove rows": "remove"}.get(outlier_choice)
+                # The export starts first so it runs while the preview is drawn; the page then waits for it
+                export = csv_processor.start_export(
+                    uploaded_file_cleaner,
+                    columns_to_include=selected_columns,
+                    columns_to_clean=selected_columns,
+                    outliers=outliers
+                )
+                preview_df = csv_processor.preview_dataframe(
+                    temp_df,
+                    columns_to_include=selected_columns,
+                    columns_to_clean=selected_columns,
+                    outliers=outliers
+                )
+                st.write("### 👀 Preview of Cleaned CSV:")
+                st.caption(f"Cleaned from the first {min(len(temp_df), csv_processor.PREVIEW_SAMPLE_ROWS):,} rows; the full file follows below.")
+                st.dataframe(preview_df, use_container_width=True)
+
+                with st.spinner("Cleaning the full file... ⏳"):
+                    try:
+                        processed_output = export.result()
+                    except Exception as e:
+                        processed_output = f"Processing error: {e}"
 
                 if isinstance(processed_output, io.StringIO):
                     st.success("✅ Successfully processed!")
-                    preview_df = pd.read_csv(io.StringIO(processed_output.getvalue()))
-                    st.write("### 👀 Preview of Cleaned CSV:")
-                    st.dataframe(preview_df.head(10), use_container_width=True)
                     st.download_button(
                         label="⬇️ Download Cleaned CSV",
                         data=processed_output.getvalue(),
@@ -0,0 +1,53 @@
+import streamlit as st
+import pandas as pd
+from Back_End import process
+from Back_End import instrumentation
+from Back_End import resources
+
+# ---- PAGE CONFIG ----
+st.set_page_config(
+    page_title="Diagnostics",
+    page_icon="⏱️",
+    layout="wide", initial_sidebar_state="collapsed"
+)
+
+# Set background image
+process.set_bg_image("Background.png")
+
+st.markdown('<h1 style="text-align: center; color: #FFFFFF;">⏱️ Diagnostics</h1>', unsafe_allow_html=True)
+st.markdown('<p style="text-align: center; color: #FFFFFF;">Time, CPU and memory spent in each backend stage since the server started.</p>', unsafe_allow_html=True)
+
+# Shared CPU and memory budgets of this server process
+load = resources.governor.status()
+cpu_col, memory_col, queue_col = st.columns(3)
+cpu_col.metric("Free CPU workers", f"{load['cpus_free']} / {load['cpu_budget']}")
+memory_col.metric("Free memory budget", f"{load['memory_free_mb']:,.0f} / {load['memory_budget_mb']:,.0f} MB")
+queue_col.metric("Queued jobs", load['queued'])
+
+records = instrumentation.get_records()
+
+if not records:
+    st.info("No stages recorded yet. Run the Cleaner, Visualize, Generate Models or Model Testing pages first.")
+else:
+    df = pd.DataFrame(records)
+    df['timestamp'] = pd.to_datetime(df['timestamp'], unit='s')
+
+    # Per-stage totals show where time actually goes
+    st.write("### Time by Stage")
+    summary = df.groupby('stage').agg(
+        calls=('stage', 'size'),
+        wall_s=('wall_s', 'sum'),
+        cpu_s=('cpu_s', 'sum'),
+        rows=('rows', 'sum'),
+        rss_delta_mb=('rss_delta_mb', 'sum'),
+        peak_growth_mb=('peak_growth_mb', 'max'),
+    ).sort_values('wall_s', ascending=False)
+    st.dataframe(summary, use_container_width=True)
+    st.bar_chart(summary['wall_s'])
+
+    st.write("### Recent Stages")
+    st.dataframe(df.sort_values('timestamp', ascending=False), use_container_width=True)
+
+    if st.button("Clear recorded stages"):
+        instrumentation.clear_records()
+        st.rerun()
@@ -1,4 +1,5 @@
 import streamlit as st
+import pandas as pd
 from Back_End import process
 from Back_End import csv_processor3  # Assuming the modified backend logic is in this script
 
@@ -60,23 +61,36 @@ st.markdown('<h1 class="title">📜 Generate Reports</h1>', unsafe_allow_html=Tr
 st.markdown('<p style="text-align: center; color: #FFFFFF;">Upload your CSV file, and we’ll create a model for you!</p>', unsafe_allow_html=True)
 
 st.markdown('<h2 class="tab_title">Generate Reports</h2>', unsafe_allow_html=True)
-uploaded_file_report = st.file_uploader("Choose a CSV file", type=["csv"], key="report")
+uploaded_files_report = st.file_uploader("Choose CSV files (partitions of one dataset) or a zip of CSVs", type=["csv", "zip", "gz", "bz2", "zst"], key="report", accept_multiple_files=True)
 
 st.markdown('<h3>Make sure that the target value should be at least column.</h2>', unsafe_allow_html=True)
 
 st.markdown("⚠️ **Note:** For best performance, please upload CSV files smaller than **25MB**.")
 
-if uploaded_file_report:
+if uploaded_files_report:
+    uploaded_file_report = uploaded_files_report[0] if len(uploaded_files_report) == 1 else uploaded_files_report
+    on_queue = process.queue_status()
     # Inform the user that the file is being processed
     with st.spinner("Processing... ⏳"):
         # Process the file using the backend function
-        processed_output = csv_processor3.process_file(uploaded_file_report)
+        processed_output = csv_processor3.process_file(uploaded_file_report, on_queue=on_queue)
+    on_queue.clear()
 
     # Check if the output is valid and provide a downloadable model file
     if isinstance(processed_output, tuple) and len(processed_output) == 4:
         model_filename, best_model_name, best_score, best_params = processed_output
         st.success(f"✅ Successfully processed! Best model: {best_model_name} with performance score: {best_score:.4f}")
 
+        # Every family is ranked on its held-out cross-validation folds
+        model_info = csv_processor3.load_model_info(model_filename)
+        if model_info.get('training_sample'):
+            sample_info = model_info['training_sample']
+            st.info(f"ℹ️ The file is too large for the memory budget, so the model was trained on a random sample of {sample_info['sample_rows']:,} of its {sample_info['rows']:,} rows.")
+        if model_info.get('leaderboard'):
+            st.write("### 🏁 Model Leaderboard (5-fold cross-validation)")
+            leaderboard = pd.DataFrame(model_info['leaderboard']).drop(columns=['params'])
+            st.dataframe(leaderboard, use_container_width=True)
+
         # Offer the pickled model file for download
         with open(model_filename, 'rb') as model_file:
             st.download_button(
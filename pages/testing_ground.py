@@ -60,17 +60,19 @@ st.markdown('<h1 class="title">🧪 Model Testing</h1>', unsafe_allow_html=True)
 st.markdown('<p style="text-align: center; color: #FFFFFF;">Upload your CSV and PKL file, and we’ll test it for you!</p>', unsafe_allow_html=True)
 
 st.markdown('<h2 class="tab_title">Model Testing</h2>', unsafe_allow_html=True)
-uploaded_csv = st.file_uploader("Choose a CSV file", type=["csv"], key="csv_uploader")
-uploaded_pkl = st.file_uploader("Choose a PKL file", type=["pkl"], key="pkl_uploader")
+uploaded_csv = st.file_uploader("Choose a CSV file", type=["csv", "gz", "bz2", "zst", "zip"], key="csv_uploader")
+uploaded_pkls = st.file_uploader("Choose one or more PKL files (several are compared on the same data)", type=["pkl"], key="pkl_uploader", accept_multiple_files=True)
 
 st.markdown("⚠️ **Note:** For best performance, please upload CSV files smaller than **25MB**.")
 
 from io import StringIO
-if uploaded_csv and uploaded_pkl:
+if uploaded_csv and uploaded_pkls:
+    on_queue = process.queue_status()
     with st.spinner("Processing... ⏳"):
-        processed_output = testing.process_file(uploaded_csv, uploaded_pkl)
+        processed_output = testing.score_models(uploaded_csv, uploaded_pkls, on_queue=on_queue)
+    on_queue.clear()
 
-    if isinstance(processed_output, tuple) and len(processed_output) == 2:
+    if isinstance(processed_output, tuple) and len(processed_output) == 2 and processed_output[1] is None:
         csv_output, _ = processed_output  # Extract the CSV content
 
         # If csv_output is a string, wrap it in StringIO to create a file-like object
@@ -78,6 +80,7 @@ if uploaded_csv and uploaded_pkl:
             csv_output = StringIO(csv_output)
         
         st.success(f"✅ Successfully processed!")
+        st.caption("Rows that could not be scored are kept, with the reason in the Status column.")
         st.download_button(
             label="⬇️ Download Cleaned CSV",
             data=csv_output.getvalue(),
@@ -86,4 +89,4 @@ if uploaded_csv and uploaded_pkl:
         )
               
     else:
-        st.error(f"❌ Error: {processed_output}")
+        st.error(f"❌ Error: {processed_output[1] if isinstance(processed_output, tuple) else processed_output}")
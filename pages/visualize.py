@@ -1,5 +1,5 @@
+import os
 import streamlit as st
-import io
 from Back_End import csv_processor2 # Ensure this script exists in the same directory
 from Back_End import process
 
@@ -61,21 +61,31 @@ st.markdown('<h1 class="title">📊 Visualize Data</h1>', unsafe_allow_html=True
 st.markdown('<p style="text-align: center; color: #FFFFFF;">Upload your CSV file, and we’ll Analyze and Visualized it for you!</p>', unsafe_allow_html=True)
 
 st.markdown('<h2 class="tab_title">Visualize Data</h2>', unsafe_allow_html=True)
-uploaded_file_analizer = st.file_uploader("Choose a CSV file", type=["csv"], key="cleaner")
+uploaded_files_analizer = st.file_uploader("Choose CSV files (partitions of one dataset) or a zip of CSVs", type=["csv", "zip", "gz", "bz2", "zst"], key="cleaner", accept_multiple_files=True)
 
 st.markdown("⚠️ **Note:** For best performance, please upload CSV files smaller than **25MB**.")
 
-if uploaded_file_analizer:
+quick_report = st.checkbox(
+    "⚡ Quick report (charts from a random sample; row and missing-value counts stay exact)",
+    help="Recommended for large files. Sampled sections are marked in the PDF."
+)
+
+if uploaded_files_analizer:
+    uploaded_file_analizer = uploaded_files_analizer[0] if len(uploaded_files_analizer) == 1 else uploaded_files_analizer
+    on_queue = process.queue_status()
     with st.spinner("Processing... ⏳"):
-        processed_output = csv_processor2.process_file(uploaded_file_analizer)
+        processed_output = csv_processor2.process_file(uploaded_file_analizer, quick=quick_report, on_queue=on_queue)
+    on_queue.clear()
 
-    if isinstance(processed_output, io.BytesIO):
-            st.success("✅ Successfully processed!")
-            st.download_button(
-                label="⬇️ Download PDF",
-                data=processed_output.getvalue(),
-                file_name="simple_pdf.pdf",
-                mime="application/pdf"
-            )
+    if isinstance(processed_output, tuple):
+        st.error(f"❌ Error: {processed_output[1]}")
     else:
-        st.error(f"❌ Error: {processed_output}")
\ No newline at end of file
+            st.success("✅ Successfully processed!")
+            with open(processed_output, "rb") as report_file:
+                st.download_button(
+                    label="⬇️ Download PDF",
+                    data=report_file,
+                    file_name="simple_pdf.pdf",
+                    mime="application/pdf"
+                )
+            os.remove(processed_output)
\ No newline at end of file
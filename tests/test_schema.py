@@ -0,0 +1,61 @@
+import io
+
+import numpy as np
+import pandas as pd
+from sklearn.linear_model import LogisticRegression
+from sklearn.pipeline import Pipeline
+
+from Back_End import csv_processor3
+from Back_End import testing
+from Back_End.schema import build_schema
+
+
+def train_package(df, target_col):
+    """A small model package built the way train_file builds one, without the model search."""
+    cleaning_plan, df = csv_processor3.fit_cleaning_plan(df, target_col)
+    X, y, task_type, y_scaler, preprocessor, _ = csv_processor3.preprocess_data(df, target_col)
+    pipeline = Pipeline([('preprocessor', preprocessor), ('model', LogisticRegression().fit(X, y))])
+    return {
+        'pipeline': pipeline,
+        'y_scaler': y_scaler,
+        'task_type': task_type,
+        'cleaning_plan': cleaning_plan.to_dict(),
+        'schema': build_schema(df.drop(columns=[target_col])),
+    }
+
+
+def test_scores_categorical_column_that_parses_as_numbers():
+    rng = np.random.default_rng(0)
+    train = pd.DataFrame({
+        'code': rng.choice(['A1', 'B2', '7'], 60),
+        'x': rng.normal(size=60),
+        'label': rng.choice(['yes', 'no'], 60),
+    })
+    package = train_package(train, 'label')
+    assert package['schema']['dtypes']['code'] == 'categorical'
+
+    # Every code in the new file is 7, so pandas parses the column as integers
+    score = pd.read_csv(io.StringIO("code,x\n7,0.1\n7,-0.4\n7,1.2\n"))
+    assert pd.api.types.is_integer_dtype(score['code'])
+
+    output, error = testing.score_with_schema(score, package)
+    assert error is None
+    result = pd.read_csv(output)
+    assert (result['Status'] == 'scored').all()
+    assert result['Predictions'].notna().all()
+
+
+def test_unconvertible_boolean_rows_are_skipped():
+    train = pd.DataFrame({
+        'flag': [True, False] * 20,
+        'x': np.arange(40, dtype=float),
+        'label': ['a', 'b', 'b', 'a'] * 10,
+    })
+    package = train_package(train, 'label')
+    assert package['schema']['dtypes']['flag'] == 'boolean'
+
+    score = pd.read_csv(io.StringIO("flag,x\ntrue,1\nmaybe,2\n0,3\n"))
+    output, error = testing.score_with_schema(score, package)
+    assert error is None
+    result = pd.read_csv(output)
+    assert result['Status'].tolist() == ['scored', 'skipped: invalid boolean in flag', 'scored']